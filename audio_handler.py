@@ -1,19 +1,128 @@
+import hashlib
+import os
+import threading
+from time import perf_counter
+from typing import Callable
+
 from pygame import mixer
-from pygame.mixer import Sound
+from pygame.mixer import Sound, Channel
+
+
+class Effect:
+    """
+    A sound effect limited to a few reserved mixer channels. Playing it
+    while every voice is busy restarts the oldest one instead of taking
+    more channels.
+    """
+    def __init__(self, sound: Sound, channels: list[Channel]) -> None:
+        """
+        Initializes a sound effect.
+
+        :param sound: the sound to play.
+        :param channels: the channels reserved for this effect.
+        """
+        self.sound: Sound = sound
+        self.channels: list[Channel] = channels
+        self.next: int = 0
+
+
+    def play(self) -> None:
+        """
+        Play the effect on the next of its channels.
+        """
+        self.channels[self.next].play(self.sound)
+        self.next = (self.next + 1) % len(self.channels)
 
 
 class AudioHandler:
     """Represents an instance of the audio manager."""
-    def __init__(self) -> None:
-        """Initializes the audio handler object."""
-        # play background music
+    def __init__(self, on_loaded: Callable[[float], None] | None = None,
+                 cache_dir: str = "save_data/audio_cache") -> None:
+        """
+        Initializes the audio handler object. The sounds are decoded on a
+        background thread and stay silent until they are ready.
+
+        :param on_loaded: called with the loading time in milliseconds once
+        every sound is ready.
+        :param cache_dir: where decoded sounds are kept between launches.
+        """
         mixer.init()
+        self.cache_dir: str = cache_dir
+
+        # reserve channels for the sound effects, with the number of voices
+        # each one may use at once
+        voices: tuple[int, ...] = (2, 1, 1, 1)
+        mixer.set_reserved(sum(voices))
+        channels: list[Channel] = [Channel(index)
+                                   for index in range(sum(voices))]
+
+        # sound effects
+        silence: Sound = Sound(buffer=bytes(4))
+        self.fruit_sound: Effect = Effect(silence, channels[0:2])
+        self.move_sound: Effect = Effect(silence, channels[2:3])
+        self.lose_sound: Effect = Effect(silence, channels[3:4])
+        self.action_sound: Effect = Effect(silence, channels[4:5])
+
+        self.on_loaded: Callable[[float], None] | None = on_loaded
+        self.loaded: threading.Event = threading.Event()
+        threading.Thread(target=self.load, daemon=True).start()
+
+
+    def load(self) -> None:
+        """
+        Decode the sound effects and start the background music.
+        """
+        start: float = perf_counter()
+
+        # play background music
         mixer.music.load("audio_files/background.mp3")
         mixer.music.set_volume(0.05)
         mixer.music.play(-1)
 
         # sound effects
-        self.fruit_sound: Sound = Sound("audio_files/score.mp3")
-        self.move_sound: Sound = Sound("audio_files/slither.mp3")
-        self.lose_sound: Sound = Sound("audio_files/lose.mp3")
-        self.action_sound: Sound = Sound("audio_files/click.mp3")
\ No newline at end of file
+        self.fruit_sound.sound = self.load_sound("audio_files/score.mp3")
+        self.move_sound.sound = self.load_sound("audio_files/slither.mp3")
+        self.lose_sound.sound = self.load_sound("audio_files/lose.mp3")
+        self.action_sound.sound = self.load_sound("audio_files/click.mp3")
+
+        self.loaded.set()
+        if self.on_loaded:
+            self.on_loaded((perf_counter() - start) * 1000)
+
+
+    def load_sound(self, path: str) -> Sound:
+        """
+        Load a sound, reusing the decoded samples from an earlier launch
+        when the file and mixer format have not changed.
+
+        :param path: the location of the sound file.
+        :return: the loaded sound.
+        """
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+
+        # the samples depend on both the file and the mixer's format
+        frequency, size, channels = mixer.get_init()
+        key: str = hashlib.sha1(data).hexdigest()
+        cache_path: str = os.path.join(self.cache_dir, f"{key}_{frequency}_"
+                                       f"{size}_{channels}.pcm")
+
+        try:
+            with open(cache_path, "rb") as file:
+                return Sound(buffer=file.read())
+        except OSError:
+            pass
+
+        sound: Sound = Sound(path)
+
+        # write to a temporary file first so a partial file is never used
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporary_path: str = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as file:
+                file.write(sound.get_raw())
+            os.replace(temporary_path, cache_path)
+        except OSError:
+            pass
+
+        return sound
@@ -0,0 +1,270 @@
+from engine import Engine, UP, DOWN, LEFT, RIGHT
+from items import HAZARD
+
+
+# turns bytes of the occupancy bitmap, and of the item kinds with only
+# hazards set, into binary digits
+DIGITS: bytes = bytes.maketrans(b"\x00\x01", b"01")
+HAZARD_DIGITS: bytes = bytes.maketrans(b"\x00\x01\x02", b"001")
+
+
+class Autopilot:
+    """
+    A controller that steers the snake towards the fruit along a shortest
+    path, as long as the snake could still reach its tail once it gets
+    there, and otherwise heads for the largest open area. The board is
+    handled as bitboards, with bit n standing for board cell n, so path
+    searches and flood fills work on whole rows of cells at once. A plan
+    is reused from one tick to the next until the fruit moves or the snake
+    leaves it.
+    """
+    def __init__(self, engine: Engine) -> None:
+        """
+        Initializes an autopilot for a game.
+
+        :param engine: the game to play.
+        """
+        self.engine: Engine = engine
+        self.width: int = engine.settings.grid_width
+        self.cells: int = self.width * engine.settings.grid_height
+
+        # every cell, and every cell except those in the first or last
+        # column, used to stop moves wrapping across the board
+        self.board: int = (1 << self.cells) - 1
+        first_column: int = sum(1 << (row * self.width)
+                                for row in range(self.cells // self.width))
+        self.not_first: int = self.board & ~first_column
+        self.not_last: int = self.board & ~(first_column <<
+                                            (self.width - 1))
+
+        # remaining moves of the current plan, the fruit it leads to and
+        # where the head should be when the next move is taken
+        self.plan: list[tuple[int,int]] = []
+        self.plan_fruit: tuple[int,int] = (-1, -1)
+        self.plan_head: int = -1
+
+        # the game and tick of the last decision, as a plan only carries on
+        # into the very next tick of the same game, not after a new game,
+        # a rewind or ticks played without the autopilot
+        self.decided_seed: int = -1
+        self.decided_tick: int = -1
+
+
+    def neighbours(self, cells: int) -> int:
+        """
+        Return the cells next to any of the given cells.
+
+        :param cells: a bitboard of cells.
+        :return: a bitboard of their neighbours.
+        """
+        return (((cells << 1) & self.not_first) |
+                ((cells >> 1) & self.not_last) |
+                (cells << self.width) | (cells >> self.width)) & self.board
+
+
+    def flood(self, start: int, free: int) -> int:
+        """
+        Return every free cell reachable from the start cells.
+
+        :param start: a bitboard of cells to start from.
+        :param free: a bitboard of the cells that can be crossed.
+        :return: a bitboard of the reachable cells.
+        """
+        reached: int = start & free
+        while True:
+            grown: int = reached | (self.neighbours(reached) & free)
+            if grown == reached:
+                return reached
+            reached = grown
+
+
+    def decide(self) -> tuple[int,int] | None:
+        """
+        Choose the direction for the next tick.
+
+        :return: the direction, or None if no move avoids dying.
+        """
+        engine: Engine = self.engine
+        body = engine.body
+        head: int = body.ids[body.start]
+
+        next_tick: bool = engine.seed == self.decided_seed and \
+            engine.ticks == self.decided_tick + 1
+        self.decided_seed = engine.seed
+        self.decided_tick = engine.ticks
+
+        # keep following the plan while nothing has invalidated it
+        if self.plan and next_tick and engine.fruit == self.plan_fruit and \
+            head == self.plan_head:
+            direction: tuple[int,int] = self.plan[-1]
+            if not body.occupied[self.follow(head, direction)]:
+                return self.next_move()
+
+        self.plan.clear()
+        occupied: int = int(body.occupied.translate(DIGITS)[::-1], 2)
+
+        # hazards never move, so they block paths like the body does
+        if engine.items.count(HAZARD):
+            occupied |= int(engine.items.kinds.translate(HAZARD_DIGITS)[::-1],
+                            2)
+        tail: int = body.ids[(body.start + body.count - 1) % body.capacity]
+
+        # the tail moves out of the way unless the snake is growing
+        free: int = self.board & ~occupied
+        if engine.length == engine.current_length:
+            free |= 1 << tail
+
+        # the engine refuses to turn back, even when the cell behind the
+        # head has just been freed
+        dx, dy = engine.direction
+        if engine.length != 1 and (dx or dy):
+            free &= ~(1 << self.follow(head, (-dx, -dy)))
+
+        path: list[int] | None = self.find_path(head, free)
+        if path and self.safe(path, occupied, tail):
+            self.plan = [self.step(path[index + 1], path[index])
+                         for index in range(len(path) - 1)]
+            self.plan_fruit = engine.fruit
+            self.plan_head = head
+            return self.next_move()
+
+        return self.escape(head, free, tail)
+
+
+    def next_move(self) -> tuple[int,int]:
+        """
+        Take the next move of the plan.
+
+        :return: the direction.
+        """
+        direction: tuple[int,int] = self.plan.pop()
+        self.plan_head = self.follow(self.plan_head, direction)
+        return direction
+
+
+    def follow(self, cell: int, direction: tuple[int,int]) -> int:
+        """
+        Return the cell reached by moving from a cell in a direction.
+
+        :param cell: the starting cell.
+        :param direction: the direction to move in.
+        :return: the cell moved to.
+        """
+        return cell + direction[0] + direction[1] * self.width
+
+
+    def find_path(self, head: int, free: int) -> list[int] | None:
+        """
+        Find a shortest path from the head to the fruit by growing layers
+        of cells at each distance from the head.
+
+        :param head: the cell of the head.
+        :param free: a bitboard of the cells that can be crossed.
+        :return: the cells of the path from the fruit back to the head, or
+        None if the fruit cannot be reached.
+        """
+        fruit_x, fruit_y = self.engine.fruit
+        fruit: int = 1 << (fruit_y * self.width + fruit_x)
+
+        layers: list[int] = [1 << head]
+        reached: int = 1 << head
+        while not layers[-1] & fruit:
+            layer: int = self.neighbours(layers[-1]) & free & ~reached
+            if not layer:
+                return None
+            reached |= layer
+            layers.append(layer)
+
+        # walk back from the fruit through one cell of each layer
+        path: list[int] = [fruit.bit_length() - 1]
+        current: int = fruit
+        for layer in reversed(layers[:-1]):
+            candidates: int = self.neighbours(current) & layer
+            current = candidates & -candidates
+            path.append(current.bit_length() - 1)
+        return path
+
+
+    def safe(self, path: list[int], occupied: int, tail: int) -> bool:
+        """
+        Check that once the snake has followed a path to the fruit, it can
+        still reach its own tail.
+
+        :param path: the cells of the path from the fruit back to the head.
+        :param occupied: a bitboard of the cells covered by the body.
+        :param tail: the cell of the tail.
+        :return: True if the tail stays reachable.
+        """
+        body = self.engine.body
+        moves: int = len(path) - 1
+
+        # the body gains the path's cells and loses as many from its tail
+        future: int = occupied
+        ids = body.cell_ids(max(body.count - moves, 0))
+        for cell in ids:
+            future &= ~(1 << cell)
+        for cell in path[:body.count]:
+            future |= 1 << cell
+
+        if moves < body.count:
+            future_tail: int = body.ids[(body.start + body.count - moves - 1)
+                                        % body.capacity]
+        else:
+            future_tail = path[min(body.count, len(path)) - 1]
+
+        free: int = (self.board & ~future) | (1 << future_tail)
+        start: int = self.neighbours(1 << path[0]) & free
+        return bool(self.flood(start, free) >> future_tail & 1)
+
+
+    def escape(self, head: int, free: int, tail: int) -> tuple[int,int] | None:
+        """
+        Choose the move that keeps the tail reachable and leaves the most
+        room, when there is no safe path to the fruit.
+
+        :param head: the cell of the head.
+        :param free: a bitboard of the cells that can be crossed.
+        :param tail: the cell of the tail.
+        :return: the direction, or None if every move is blocked.
+        """
+        best: tuple[int,int] | None = None
+        best_score: tuple[bool, int] = (False, -1)
+
+        for cell in self.cells_of(self.neighbours(1 << head) & free):
+            area: int = self.flood(1 << cell, free)
+            score: tuple[bool, int] = (bool(area >> tail & 1),
+                                       area.bit_count())
+            if score > best_score:
+                best, best_score = self.step(head, cell), score
+
+        return best
+
+
+    def cells_of(self, cells: int):
+        """
+        Iterate over the cells of a bitboard.
+
+        :param cells: a bitboard of cells.
+        """
+        while cells:
+            lowest: int = cells & -cells
+            yield lowest.bit_length() - 1
+            cells ^= lowest
+
+
+    def step(self, start: int, end: int) -> tuple[int,int]:
+        """
+        Return the direction from a cell to a neighbouring one.
+
+        :param start: the first cell.
+        :param end: the neighbouring cell.
+        :return: the direction.
+        """
+        difference: int = end - start
+        if difference == 1:
+            return RIGHT
+        if difference == -1:
+            return LEFT
+        if difference == self.width:
+            return DOWN
+        return UP
@@ -0,0 +1,178 @@
+import numpy as np
+
+from game_settings import Settings
+
+
+# actions: keep the current direction, or turn up, down, left or right
+KEEP, UP, DOWN, LEFT, RIGHT = range(5)
+
+# column and row steps for each action, KEEP leaves the direction as is
+ACTION_DX: np.ndarray = np.array([0, 0, 0, -1, 1], dtype=np.int32)
+ACTION_DY: np.ndarray = np.array([0, -1, 1, 0, 0], dtype=np.int32)
+
+
+class BatchEngine:
+    """
+    Many games stored side by side in NumPy arrays and advanced together,
+    following the same rules as the single-game engine. Finished games are
+    reset automatically. Positions are board cell indices.
+    """
+    def __init__(self, settings: Settings, count: int,
+                 seed: int | None = None) -> None:
+        """
+        Initializes a batch of games and starts all of them.
+
+        :param settings: the game settings.
+        :param count: the number of games in the batch.
+        :param seed: the seed for fruit placement, random if None.
+        """
+        self.settings: Settings = settings
+        self.count: int = count
+        self.rng: np.random.Generator = np.random.default_rng(seed)
+
+        # board dimensions in cells
+        self.grid_width: int = settings.grid_width
+        self.grid_height: int = settings.grid_height
+        self.cells: int = self.grid_width * self.grid_height
+        self.center: int = (self.grid_height // 2 * self.grid_width +
+                            self.grid_width // 2)
+
+        # cells a fruit may spawn on
+        margin: int = settings.fruit_margin
+        spawnable: np.ndarray = np.zeros((self.grid_height, self.grid_width),
+                                         dtype=bool)
+        spawnable[margin:self.grid_height - margin,
+                  margin:self.grid_width - margin] = True
+        self.spawnable: np.ndarray = spawnable.ravel()
+
+        # body ring buffers of cell indices, ordered from head to tail
+        # starting at each game's start index, and occupancy grids
+        self.body: np.ndarray = np.zeros((count, self.cells), dtype=np.int32)
+        self.start: np.ndarray = np.zeros(count, dtype=np.int32)
+        self.occupied: np.ndarray = np.zeros((count, self.cells), dtype=bool)
+
+        # head position and direction
+        self.head_x: np.ndarray = np.zeros(count, dtype=np.int32)
+        self.head_y: np.ndarray = np.zeros(count, dtype=np.int32)
+        self.dx: np.ndarray = np.zeros(count, dtype=np.int32)
+        self.dy: np.ndarray = np.zeros(count, dtype=np.int32)
+
+        # target length, number of cells covered, score and fruit cell
+        self.length: np.ndarray = np.ones(count, dtype=np.int32)
+        self.current_length: np.ndarray = np.ones(count, dtype=np.int32)
+        self.score: np.ndarray = np.zeros(count, dtype=np.int32)
+        self.fruit: np.ndarray = np.zeros(count, dtype=np.int32)
+
+        self.rows: np.ndarray = np.arange(count)
+        self.reset(self.rows)
+
+
+    def reset(self, rows: np.ndarray) -> None:
+        """
+        Start new games on the given boards.
+
+        :param rows: the indices of the boards to reset.
+        """
+        if not len(rows):
+            return
+
+        self.occupied[rows] = False
+        self.start[rows] = 0
+        self.body[rows, 0] = self.center
+        self.occupied[rows, self.center] = True
+
+        self.head_x[rows] = self.grid_width // 2
+        self.head_y[rows] = self.grid_height // 2
+        self.dx[rows] = 0
+        self.dy[rows] = 0
+
+        self.length[rows] = 1
+        self.current_length[rows] = 1
+        self.score[rows] = 0
+
+        self.spawn_fruit(rows)
+
+
+    def spawn_fruit(self, rows: np.ndarray) -> None:
+        """
+        Spawn a fruit on a random free cell of each of the given boards.
+        Boards without a free cell keep their current fruit.
+
+        :param rows: the indices of the boards that need a new fruit.
+        """
+        if not len(rows):
+            return
+
+        # give every free cell a random key and pick the largest
+        free: np.ndarray = ~self.occupied[rows] & self.spawnable
+        keys: np.ndarray = self.rng.random((len(rows), self.cells))
+        keys[~free] = -1.0
+        picks: np.ndarray = keys.argmax(axis=1)
+
+        has_free: np.ndarray = free.any(axis=1)
+        self.fruit[rows[has_free]] = picks[has_free]
+
+
+    def step(self, actions: np.ndarray) \
+        -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance every game by one tick.
+
+        :param actions: one action per board.
+        :return: the reward for each board (1 for a fruit, -1 for dying),
+        whether each game ended this tick and each game's score. Ended
+        games report their final score and have already been reset.
+        """
+        actions = np.asarray(actions)
+        rows: np.ndarray = self.rows
+
+        # turn unless it would reverse the snake into itself
+        new_dx: np.ndarray = ACTION_DX[actions]
+        new_dy: np.ndarray = ACTION_DY[actions]
+        blocked: np.ndarray = (((new_dx != 0) & (self.dx != 0)) |
+                               ((new_dy != 0) & (self.dy != 0))) & \
+                              (self.length != 1)
+        turning: np.ndarray = (actions != KEEP) & ~blocked
+        self.dx = np.where(turning, new_dx, self.dx)
+        self.dy = np.where(turning, new_dy, self.dy)
+
+        # get new position and check for collision with the walls
+        new_x: np.ndarray = self.head_x + self.dx
+        new_y: np.ndarray = self.head_y + self.dy
+        alive: np.ndarray = (new_x >= 0) & (new_x < self.grid_width) & \
+                            (new_y >= 0) & (new_y < self.grid_height)
+        new_cell: np.ndarray = np.where(alive, new_y * self.grid_width +
+                                        new_x, 0)
+
+        # delete the tail or grow
+        growing: np.ndarray = self.current_length < self.length
+        popping: np.ndarray = alive & ~growing
+        tail: np.ndarray = (self.start + self.current_length - 1) % self.cells
+        tail_cell: np.ndarray = self.body[rows, tail]
+        self.occupied[rows[popping], tail_cell[popping]] = False
+        self.current_length += alive & growing
+
+        # check for collision with tail
+        collided: np.ndarray = alive & self.occupied[rows, new_cell]
+
+        # add new head
+        moving: np.ndarray = rows[alive]
+        self.start[moving] = (self.start[moving] - 1) % self.cells
+        self.body[moving, self.start[moving]] = new_cell[moving]
+        self.occupied[moving, new_cell[moving]] = True
+        self.head_x[moving] = new_x[moving]
+        self.head_y[moving] = new_y[moving]
+
+        # check for fruit
+        ate: np.ndarray = alive & ~collided & (new_cell == self.fruit)
+        self.length += ate
+        self.score += ate
+        self.spawn_fruit(rows[ate])
+
+        done: np.ndarray = ~alive | collided
+        rewards: np.ndarray = ate.astype(np.int32) - done
+        scores: np.ndarray = self.score.copy()
+
+        self.reset(rows[done])
+
+        return rewards, done, scores
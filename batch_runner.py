@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from game_settings import Settings
+from engine import Engine, UP, DOWN, LEFT, RIGHT
+from autopilot import Autopilot
+
+
+POLICIES: tuple[str, ...] = ("autopilot", "random")
+
+
+def play_games(policy: str, seeds: range) -> list[tuple[int, int, int, int]]:
+    """
+    Play a run of games headlessly in a worker process.
+
+    :param policy: the name of the policy that steers the snake.
+    :param seeds: the seed of each game to play.
+    :return: the seed, score, length and number of ticks of each game.
+    """
+    settings: Settings = Settings()
+    engine: Engine = Engine(settings, seeds[0])
+    autopilot: Autopilot = Autopilot(engine)
+
+    # a game that goes this long without eating is stuck in a loop
+    stall_limit: int = settings.grid_width * settings.grid_height * 4
+
+    results: list[tuple[int, int, int, int]] = []
+    for seed in seeds:
+        engine.reset(seed)
+        moves: random.Random = random.Random(seed)
+        last_meal: int = 0
+
+        while not engine.done and engine.ticks - last_meal < stall_limit:
+            if policy == "autopilot":
+                action: tuple[int,int] | None = autopilot.decide()
+            else:
+                action = moves.choice((UP, DOWN, LEFT, RIGHT))
+
+            reward, done, score = engine.step(action)
+            if reward > 0:
+                last_meal = engine.ticks
+
+        results.append((seed, engine.score, engine.current_length,
+                        engine.ticks))
+
+    return results
+
+
+def distribution(values: list[float]) -> dict[str, float]:
+    """
+    Summarize a list of values.
+
+    :param values: the values.
+    :return: the minimum, mean, median, 90th percentile and maximum.
+    """
+    ordered: list[float] = sorted(values)
+    return {"min": ordered[0],
+            "mean": statistics.fmean(ordered),
+            "median": statistics.median(ordered),
+            "p90": ordered[round((len(ordered) - 1) * 0.9)],
+            "max": ordered[-1]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play many games without "
+                                     "a window across every CPU core.")
+    parser.add_argument("--games", type=int, default=1000,
+                        help="number of games to play")
+    parser.add_argument("--policy", choices=POLICIES, default="autopilot",
+                        help="what steers the snake")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first game, the rest follow on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes")
+    parser.add_argument("--chunk", type=int, default=50,
+                        help="games sent to a worker at a time")
+    parser.add_argument("--json", default="",
+                        help="file to write every game and the summary to")
+    args = parser.parse_args()
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    settings: Settings = Settings()
+    start: float = perf_counter()
+    games: list[tuple[int, int, int, int]] = []
+
+    # each chunk plays consecutive seeds, so results do not depend on how
+    # the games are spread across workers
+    with ProcessPoolExecutor(args.workers) as executor:
+        futures = [executor.submit(play_games, args.policy,
+                                   range(first, min(first + args.chunk,
+                                                    args.seed + args.games)))
+                   for first in range(args.seed, args.seed + args.games,
+                                      args.chunk)]
+
+        for future in as_completed(futures):
+            games.extend(future.result())
+            print(f"\r{len(games)}/{args.games} games", end="",
+                  file=sys.stderr, flush=True)
+    print(file=sys.stderr)
+
+    elapsed: float = perf_counter() - start
+    ticks: int = sum(game[3] for game in games)
+    summary: dict = {
+        "games": len(games),
+        "policy": args.policy,
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed,
+        "score": distribution([game[1] for game in games]),
+        "length": distribution([game[2] for game in games]),
+        "duration_seconds": distribution([game[3] / settings.tick_rate
+                                          for game in games]),
+    }
+
+    print(f"{summary['games']} games with {args.policy} in {elapsed:.1f} s "
+          f"({summary['ticks_per_second']:,.0f} ticks/s)")
+    for name in ("score", "length", "duration_seconds"):
+        stats: dict[str, float] = summary[name]
+        print(f"{name:>16}: " + "  ".join(f"{key} {value:.1f}"
+                                          for key, value in stats.items()))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"summary": summary,
+                       "games": [dict(zip(("seed", "score", "length",
+                                           "ticks"), game))
+                                 for game in sorted(games)]}, file, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import tracemalloc
+from functools import partial
+from time import perf_counter
+
+# run without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from pygame import Surface
+
+from game_settings import Settings
+from ui_handler import UIHandler
+from scene_manager import SceneManager, GAME
+from audio_handler import AudioHandler
+from snake import Snake
+from engine import Engine
+
+
+# board sizes in cells, each with an even height so a cycle covers it
+GRIDS: tuple[tuple[int,int], ...] = ((30, 20), (60, 40), (100, 100))
+
+# snake lengths as fractions of the board
+FRACTIONS: tuple[float, ...] = (0.0, 0.1, 0.25, 0.5, 0.75, 1.0)
+
+
+def board_settings(width: int, height: int, directory: str) -> Settings:
+    """
+    Return settings for a board of the given size that keep every file the
+    game writes inside a temporary directory.
+
+    :param width: the number of columns.
+    :param height: the number of rows.
+    :param directory: the temporary directory.
+    :return: the settings.
+    """
+    settings: Settings = Settings()
+    settings.screen_width = width * settings.snake_size
+    settings.screen_height = height * settings.snake_size
+    settings.grid_width = width
+    settings.grid_height = height
+    settings.save_path = os.path.join(directory, "scores.db")
+    settings.replay_path = ""
+    settings.report_startup = False
+    return settings
+
+
+def cycle(width: int, height: int) -> list[tuple[int,int]]:
+    """
+    Return a path visiting every cell once and ending next to its start,
+    along the top row, back and forth over the other columns, then up the
+    first column.
+
+    :param width: the number of columns.
+    :param height: the number of rows, which must be even.
+    :return: the cells of the path in order.
+    """
+    path: list[tuple[int,int]] = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        path.extend((x, y) for x in columns)
+    path.extend((0, y) for y in range(height - 1, 0, -1))
+    return path
+
+
+def build_snake(settings: Settings, length: int, path: list[tuple[int,int]],
+                audio: AudioHandler) -> Snake:
+    """
+    Create a snake of the given length lying along the path, with its head
+    at the path's end and no fruit on the board.
+
+    :param settings: the game settings.
+    :param length: the length of the snake.
+    :param path: the cycle the snake lies and moves along.
+    :param audio: a reference to the audio handler.
+    :return: the snake.
+    """
+    screen: Surface = Surface((settings.screen_width,
+                               settings.screen_height))
+    scene: SceneManager = SceneManager()
+    scene.switch(GAME)
+    ui: UIHandler = UIHandler(settings, screen, scene)
+    ui.moving = True
+
+    snake: Snake = Snake(settings, screen, ui, scene, audio)
+    engine = snake.engine
+    engine.body.clear()
+    for x, y in path[:length]:
+        engine.body.push_head(x, y)
+    engine.length = engine.current_length = length
+
+    # keep the fruit off the board so the length stays fixed
+    engine.clear_items()
+    engine.fruit = (-1, -1)
+    return snake
+
+
+def respawn_fruit(engine: Engine) -> None:
+    """
+    Spawn a fruit and take it off the board again, so the board is the
+    same before every call.
+
+    :param engine: the engine to spawn the fruit in.
+    """
+    engine.spawn_fruit()
+    fruit_x, fruit_y = engine.fruit
+    engine.remove_item(fruit_y * engine.settings.grid_width + fruit_x)
+
+
+def hot_paths(snake: Snake, path: list[tuple[int,int]], length: int) \
+    -> dict:
+    """
+    Return the functions run every tick or frame, for a snake built along
+    a cycle.
+
+    :param snake: the snake, as built by build_snake.
+    :param path: the cycle the snake lies and moves along.
+    :param length: the length of the snake.
+    :return: each function, taking no arguments, by name.
+    """
+    position: list[int] = [length - 1]
+
+    def update() -> None:
+        # follow the cycle so the snake never dies
+        x, y = path[position[0]]
+        position[0] = (position[0] + 1) % len(path)
+        next_x, next_y = path[position[0]]
+        snake.queue_turn((next_x - x, next_y - y))
+        snake.update()
+
+    return {"update": update,
+            "spawn_fruit": partial(respawn_fruit, snake.engine),
+            "draw_snake": snake.draw_snake,
+            "draw_ui": snake.ui.draw_ui}
+
+
+def measure(function, calls: int) -> dict[str, float]:
+    """
+    Time a function and measure the memory it allocates.
+
+    :param function: the function to call with no arguments.
+    :param calls: the number of calls to time.
+    :return: the mean time per call in microseconds, the largest memory
+    held during a call, and the memory and blocks left behind per call.
+    """
+    start: float = perf_counter()
+    for _ in range(calls):
+        function()
+    elapsed: float = perf_counter() - start
+
+    tracemalloc.start()
+    peak: int = 0
+    before = tracemalloc.take_snapshot()
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        current: int = tracemalloc.get_traced_memory()[0]
+        function()
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    return {"us_per_call": elapsed / calls * 1e6,
+            "alloc_peak_bytes": peak,
+            "alloc_net_bytes": sum(stat.size_diff for stat in stats) / calls,
+            "alloc_net_blocks": sum(stat.count_diff for stat in stats) /
+                                calls}
+
+
+def run(calls: int) -> list[dict]:
+    """
+    Benchmark the hot paths on every board size and snake length.
+
+    :param calls: the number of calls to time for each measurement.
+    :return: one result per board, length and function.
+    """
+    results: list[dict] = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        audio: AudioHandler = AudioHandler(cache_dir=directory)
+
+        for width, height in GRIDS:
+            settings: Settings = board_settings(width, height, directory)
+            path: list[tuple[int,int]] = cycle(width, height)
+            cells: int = width * height
+
+            for length in sorted({max(1, round(cells * fraction))
+                                  for fraction in FRACTIONS}):
+                snake: Snake = build_snake(settings, length, path, audio)
+                for name, function in hot_paths(snake, path,
+                                                length).items():
+                    result: dict = {"grid": [width, height],
+                                    "length": length, "function": name}
+                    result.update(measure(function, calls))
+                    results.append(result)
+
+                    print(f"{width}x{height} length {length:>6} "
+                          f"{name:<12} {result['us_per_call']:10.2f} us "
+                          f"{result['alloc_peak_bytes']:>8} B peak",
+                          file=sys.stderr)
+
+                snake.scores.close()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot "
+                                     "paths across snake lengths and board "
+                                     "sizes.")
+    parser.add_argument("--calls", type=int, default=200,
+                        help="calls per measurement")
+    parser.add_argument("--out", default="-",
+                        help="file for the JSON results, - for stdout")
+    args = parser.parse_args()
+
+    pygame.init()
+    report: dict = {"python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "platform": platform.platform(),
+                    "calls": args.calls,
+                    "results": run(args.calls)}
+
+    if args.out == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.out, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,453 @@
+import random
+from array import array
+
+from game_settings import Settings
+
+
+class FreeCells:
+    """
+    An index of the board cells a fruit may spawn on. Cells are kept in a
+    packed array with a reverse lookup of each cell's position in it, so
+    removing, restoring and sampling a cell are all constant time.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes the index with every cell inside the fruit margin.
+
+        :param settings: a reference to the game settings.
+        """
+        self.grid_width: int = settings.grid_width
+        self.grid_height: int = settings.grid_height
+
+        # position of each board cell in the packed array, -1 if it is not
+        # a free spawn cell, and the cells inside the margin, which are
+        # restored when the body leaves them
+        cells: int = self.grid_width * self.grid_height
+        self.positions: array = array("i", [-1]) * cells
+        self.cells: array = array("i")
+        self.spawnable: bytearray = bytearray(cells)
+
+        self.margin: int = settings.fruit_margin
+        self.count: int = 0
+        self.reset()
+
+        # the position the most recently taken cell was removed from, -1 if
+        # it was not free, kept so the removal can be undone exactly
+        self.removed_from: int = -1
+
+
+    def reset(self) -> None:
+        """
+        Mark every cell inside the margin as free, in board order, so a game
+        started with a seed spawns the same fruits whatever came before it.
+        """
+        # fill a row at a time so large boards set up quickly
+        self.positions[:] = array("i", [-1]) * len(self.positions)
+        del self.cells[:]
+        row_length: int = self.grid_width - 2 * self.margin
+        for y in range(self.margin, self.grid_height - self.margin):
+            first: int = y * self.grid_width + self.margin
+            self.positions[first:first + row_length] = \
+                array("i", range(len(self.cells),
+                                 len(self.cells) + row_length))
+            self.cells.extend(range(first, first + row_length))
+            self.spawnable[first:first + row_length] = b"\x01" * row_length
+        self.count = len(self.cells)
+
+
+    def remove(self, cell: int) -> None:
+        """
+        Mark a cell as taken by swapping it with the last free cell.
+
+        :param cell: the index of the cell on the board.
+        """
+        position: int = self.positions[cell]
+        self.removed_from = position
+        if position < 0:
+            return
+
+        self.count -= 1
+        last: int = self.cells[self.count]
+        self.cells[position] = last
+        self.positions[last] = position
+        self.cells[self.count] = cell
+        self.positions[cell] = -1
+
+
+    def add(self, cell: int) -> None:
+        """
+        Mark a cell as free again.
+
+        :param cell: the index of the cell on the board.
+        """
+        if not self.spawnable[cell] or self.positions[cell] >= 0:
+            return
+
+        self.cells[self.count] = cell
+        self.positions[cell] = self.count
+        self.count += 1
+
+
+    def undo_remove(self, cell: int, position: int) -> None:
+        """
+        Undo the most recent change, which removed a cell.
+
+        :param cell: the index of the cell on the board.
+        :param position: the position it was removed from, -1 if it was
+        not free.
+        """
+        if position < 0:
+            return
+
+        # the cell swapped into its place goes back to the end, unless the
+        # cell was the last one, when the slot past the end may be stale
+        if position != self.count:
+            last: int = self.cells[position]
+            self.cells[self.count] = last
+            self.positions[last] = self.count
+        self.cells[position] = cell
+        self.positions[cell] = position
+        self.count += 1
+
+
+    def undo_add(self, cell: int) -> None:
+        """
+        Undo the most recent change, which added a cell back.
+
+        :param cell: the index of the cell on the board.
+        """
+        if self.positions[cell] < 0:
+            return
+
+        self.count -= 1
+        self.positions[cell] = -1
+
+
+    def choice(self, rng: random.Random) -> int | None:
+        """
+        Pick a random free cell.
+
+        :param rng: the random number generator to draw from.
+        :return: the index of the cell on the board, or None if the board
+        is full.
+        """
+        if not self.count:
+            return None
+        return self.cells[rng.randrange(self.count)]
+
+
+class ChunkIndex:
+    """
+    A spatial index grouping the body's cells into square chunks of the
+    board, so the cells inside an area can be found without walking the
+    whole body.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes an empty chunk index.
+
+        :param settings: a reference to the game settings.
+        """
+        self.grid_width: int = settings.grid_width
+        self.chunk_size: int = settings.chunk_size
+        self.row_chunks: int = -(-self.grid_width // self.chunk_size)
+
+        # the body cells in each chunk that has any
+        self.chunks: dict[int, set[int]] = {}
+
+
+    def chunk(self, cell: int) -> int:
+        """
+        Return the chunk a cell belongs to.
+
+        :param cell: the index of the cell on the board.
+        :return: the index of the chunk.
+        """
+        return (cell // self.grid_width // self.chunk_size *
+                self.row_chunks +
+                cell % self.grid_width // self.chunk_size)
+
+
+    def add(self, cell: int) -> None:
+        """
+        Add a body cell to its chunk.
+
+        :param cell: the index of the cell on the board.
+        """
+        chunk: int = self.chunk(cell)
+        cells: set[int] | None = self.chunks.get(chunk)
+        if cells is None:
+            self.chunks[chunk] = {cell}
+        else:
+            cells.add(cell)
+
+
+    def remove(self, cell: int) -> None:
+        """
+        Remove a body cell from its chunk.
+
+        :param cell: the index of the cell on the board.
+        """
+        chunk: int = self.chunk(cell)
+        cells: set[int] | None = self.chunks.get(chunk)
+        if cells is not None:
+            cells.discard(cell)
+            if not cells:
+                del self.chunks[chunk]
+
+
+    def visible(self, left: int, top: int, right: int, bottom: int):
+        """
+        Iterate over the body cells inside an area of the board.
+
+        :param left: the first column of the area.
+        :param top: the first row of the area.
+        :param right: the column after the area.
+        :param bottom: the row after the area.
+        """
+        size: int = self.chunk_size
+        for chunk_y in range(top // size, (bottom - 1) // size + 1):
+            for chunk_x in range(left // size, (right - 1) // size + 1):
+                cells: set[int] | None = self.chunks.get(
+                    chunk_y * self.row_chunks + chunk_x)
+                if not cells:
+                    continue
+                for cell in cells:
+                    x, y = cell % self.grid_width, cell // self.grid_width
+                    if left <= x < right and top <= y < bottom:
+                        yield x, y
+
+
+class Body:
+    """
+    A fixed-capacity ring buffer holding the cells of the snake's body,
+    ordered from head to tail, together with an occupancy bitmap of the
+    board so that growing, dropping the tail and collision checks are
+    all constant time. The body also keeps the free spawn cells index
+    up to date as it moves.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes an empty body sized for the whole board.
+
+        :param settings: a reference to the game settings.
+        """
+        # board dimensions in cells
+        self.grid_width: int = settings.grid_width
+        self.grid_height: int = settings.grid_height
+
+        # the body can cover every cell of the board, plus the head when it
+        # has just left the board
+        self.capacity: int = self.grid_width * self.grid_height + 1
+        self.xs: array = array("i", [0]) * self.capacity
+        self.ys: array = array("i", [0]) * self.capacity
+
+        # board cell index of each part, -1 for a head that left the board
+        self.ids: array = array("i", [0]) * self.capacity
+
+        # index of the head in the buffer and number of stored cells
+        self.start: int = 0
+        self.count: int = 0
+
+        # running totals of cells added and removed, used by the renderer
+        # to find the cells that changed since the last frame
+        self.pushed: int = 0
+        self.popped: int = 0
+
+        # running total of pushes and pops undone by rewinding, after which
+        # the renderer redraws everything
+        self.undone: int = 0
+
+        # one byte per board cell, set while a body part covers it
+        self.occupied: bytearray = bytearray(self.grid_width *
+                                             self.grid_height)
+
+        # cells not covered by the body that a fruit may spawn on
+        self.free: FreeCells = FreeCells(settings)
+
+        # body cells grouped by area, used to draw only the visible part
+        # of large boards
+        self.chunks: ChunkIndex | None = None
+        if settings.large_world:
+            self.chunks = ChunkIndex(settings)
+
+
+    def __len__(self) -> int:
+        """
+        Return the number of cells in the body.
+        """
+        return self.count
+
+
+    def __iter__(self):
+        """
+        Iterate over the cells of the body from head to tail.
+        """
+        for offset in range(self.count):
+            index: int = (self.start + offset) % self.capacity
+            yield self.xs[index], self.ys[index]
+
+
+    def cell(self, offset: int) -> tuple[int,int]:
+        """
+        Return a cell of the body by its distance from the head. Offsets
+        past the tail give the most recently removed cells, for as long as
+        they have not been overwritten.
+
+        :param offset: the distance from the head.
+        :return: the column and row of the cell.
+        """
+        index: int = (self.start + offset) % self.capacity
+        return self.xs[index], self.ys[index]
+
+
+    def cell_ids(self, first: int = 0) -> array:
+        """
+        Return the board cell indices of the body from a distance from the
+        head to the tail, as at most two slices of the buffer.
+
+        :param first: the distance from the head of the first cell.
+        :return: the cell indices.
+        """
+        if first >= self.count:
+            return array("i")
+
+        start: int = (self.start + first) % self.capacity
+        end: int = start + self.count - first
+        if end <= self.capacity:
+            return self.ids[start:end]
+        return self.ids[start:] + self.ids[:end - self.capacity]
+
+
+    @property
+    def head(self) -> tuple[int,int]:
+        """
+        The cell currently occupied by the head.
+        """
+        return self.xs[self.start], self.ys[self.start]
+
+
+    def on_board(self, x: int, y: int) -> bool:
+        """
+        Check whether a cell lies inside the board.
+
+        :param x: the column of the cell.
+        :param y: the row of the cell.
+        :return: True if the cell is on the board.
+        """
+        return 0 <= x < self.grid_width and 0 <= y < self.grid_height
+
+
+    def contains(self, x: int, y: int) -> bool:
+        """
+        Check whether a cell is covered by the body.
+
+        :param x: the column of the cell.
+        :param y: the row of the cell.
+        :return: True if a body part covers the cell.
+        """
+        return self.on_board(x, y) and \
+            bool(self.occupied[y * self.grid_width + x])
+
+
+    def push_head(self, x: int, y: int) -> None:
+        """
+        Add a new head in front of the current one.
+
+        :param x: the column of the new head.
+        :param y: the row of the new head.
+        """
+        self.start = (self.start - 1) % self.capacity
+        self.xs[self.start] = x
+        self.ys[self.start] = y
+        self.count += 1
+        self.pushed += 1
+
+        if self.on_board(x, y):
+            cell: int = y * self.grid_width + x
+            self.ids[self.start] = cell
+            self.occupied[cell] = 1
+            self.free.remove(cell)
+            if self.chunks:
+                self.chunks.add(cell)
+        else:
+            self.ids[self.start] = -1
+
+
+    def pop_tail(self) -> tuple[int,int]:
+        """
+        Remove the last part of the body.
+
+        :return: the cell that was freed.
+        """
+        self.count -= 1
+        self.popped += 1
+        index: int = (self.start + self.count) % self.capacity
+        x, y = self.xs[index], self.ys[index]
+
+        if self.on_board(x, y):
+            cell: int = y * self.grid_width + x
+            self.occupied[cell] = 0
+            self.free.add(cell)
+            if self.chunks:
+                self.chunks.remove(cell)
+
+        return x, y
+
+
+    def pop_head(self, position: int, covered: bool = False) \
+        -> tuple[int,int]:
+        """
+        Remove the head, undoing the most recent push_head.
+
+        :param position: the position the head's cell was taken from in the
+        free cells index, -1 if it was not free.
+        :param covered: whether another part of the body covers the head's
+        cell too, as after running into the body.
+        :return: the cell the head was on.
+        """
+        x, y = self.xs[self.start], self.ys[self.start]
+        self.start = (self.start + 1) % self.capacity
+        self.count -= 1
+        self.undone += 1
+
+        if self.on_board(x, y) and not covered:
+            cell: int = y * self.grid_width + x
+            self.occupied[cell] = 0
+            self.free.undo_remove(cell, position)
+            if self.chunks:
+                self.chunks.remove(cell)
+
+        return x, y
+
+
+    def push_tail(self, x: int, y: int) -> None:
+        """
+        Add a part behind the tail, undoing the most recent pop_tail.
+
+        :param x: the column of the part.
+        :param y: the row of the part.
+        """
+        index: int = (self.start + self.count) % self.capacity
+        cell: int = y * self.grid_width + x
+        self.xs[index] = x
+        self.ys[index] = y
+        self.ids[index] = cell
+        self.count += 1
+        self.undone += 1
+
+        self.occupied[cell] = 1
+        self.free.undo_add(cell)
+        if self.chunks:
+            self.chunks.add(cell)
+
+
+    def clear(self) -> None:
+        """
+        Remove every part of the body, leaving the free cells index as it
+        was when the body was created.
+        """
+        while self.count:
+            self.pop_tail()
+        self.start = 0
+        self.free.reset()
@@ -0,0 +1,62 @@
+from pygame import Rect
+
+from game_settings import Settings
+
+
+class Camera:
+    """
+    A window-sized view of a board larger than the window, kept centred on
+    the head without showing anything past the edges of the board.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes a camera at the top left of the board.
+
+        :param settings: the game settings.
+        """
+        self.settings: Settings = settings
+        self.size: int = settings.snake_size
+
+        # top left of the view in board pixels
+        self.x: int = 0
+        self.y: int = 0
+
+        # furthest the view can move before showing past the board
+        self.max_x: int = max(0, settings.grid_width * self.size -
+                              settings.screen_width)
+        self.max_y: int = max(0, settings.grid_height * self.size -
+                              settings.screen_height)
+
+
+    def follow(self, head: Rect) -> None:
+        """
+        Centre the view on the head.
+
+        :param head: the area of the head in board pixels.
+        """
+        self.x = min(max(head.centerx - self.settings.screen_width // 2, 0),
+                     self.max_x)
+        self.y = min(max(head.centery - self.settings.screen_height // 2, 0),
+                     self.max_y)
+
+
+    def visible_cells(self) -> tuple[int, int, int, int]:
+        """
+        Return the cells in view.
+
+        :return: the first column and row in view and the column and row
+        after the view.
+        """
+        return (self.x // self.size, self.y // self.size,
+                -(-(self.x + self.settings.screen_width) // self.size),
+                -(-(self.y + self.settings.screen_height) // self.size))
+
+
+    def to_screen(self, rect: Rect) -> Rect:
+        """
+        Move an area from board pixels to screen pixels.
+
+        :param rect: the area in board pixels.
+        :return: the area on screen.
+        """
+        return rect.move(-self.x, -self.y)
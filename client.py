@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import random
+import socket
+import sys
+
+import pygame
+from pygame import Surface
+from pygame.time import Clock
+
+from game_settings import Settings
+from tiles import Tiles
+from network import NEW_GAME, DIRECTIONS, RemoteBoard
+from controls import DIRECTION_KEYS
+
+
+def play(settings: Settings, host: str, port: int) -> None:
+    """
+    Play a game on a server in a window, drawing the board from the
+    changes the server sends.
+
+    :param settings: the game settings.
+    :param host: the address of the server.
+    :param port: the port of the server.
+    """
+    connection: socket.socket = socket.create_connection((host, port))
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    connection.setblocking(False)
+
+    pygame.init()
+    pygame.display.set_caption("Snake")
+    screen: Surface = pygame.display.set_mode((settings.screen_width,
+                                               settings.screen_height))
+    tiles: Tiles = Tiles(settings)
+    clock: Clock = pygame.time.Clock()
+    board: RemoteBoard = RemoteBoard()
+    size: int = settings.snake_size
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                connection.close()
+                return
+            elif event.type == pygame.KEYDOWN:
+                if event.key in DIRECTION_KEYS:
+                    direction: tuple[int,int] = DIRECTION_KEYS[event.key]
+                    connection.send(bytes((DIRECTIONS.index(direction) + 1,)))
+                elif event.key == pygame.K_p and board.done:
+                    connection.send(bytes((NEW_GAME,)))
+
+        try:
+            while data := connection.recv(4096):
+                board.feed(data)
+            # an empty read means the server closed the connection
+            connection.close()
+            return
+        except BlockingIOError:
+            pass
+
+        if board.started:
+            screen.fill(settings.bg_color)
+            screen.blit(tiles.fruit, (board.fruit[0] * size,
+                                      board.fruit[1] * size))
+            screen.blits([(tiles.body, (x * size, y * size))
+                          for x, y in board.body], False)
+            head_x, head_y = board.body[0]
+            screen.blit(tiles.head, (head_x * size, head_y * size))
+            pygame.display.set_caption(f"Snake - {board.score}"
+                                       f"{' - press P' if board.done else ''}")
+            pygame.display.flip()
+
+        clock.tick(settings.frame_rate)
+
+
+async def bot(host: str, port: int, seconds: float,
+              rng: random.Random) -> tuple[int, int, int]:
+    """
+    Play on a server with random inputs, checking that the board rebuilt
+    from the changes stays consistent.
+
+    :param host: the address of the server.
+    :param port: the port of the server.
+    :param seconds: how long to play for.
+    :param rng: the source of the random inputs.
+    :return: the number of messages and bytes received, and the number of
+    inconsistent boards seen.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    board: RemoteBoard = RemoteBoard()
+    messages: int = 0
+    received: int = 0
+    errors: int = 0
+
+    loop = asyncio.get_running_loop()
+    end: float = loop.time() + seconds
+    while loop.time() < end:
+        try:
+            data: bytes = await asyncio.wait_for(reader.read(4096),
+                                                 end - loop.time())
+        except asyncio.TimeoutError:
+            break
+        if not data:
+            break
+        messages += board.feed(data)
+        received += len(data)
+
+        # a live snake never overlaps itself or leaves the board
+        if not board.done and (len(set(board.body)) != len(board.body) or
+                               any(not (0 <= x < board.grid_width and
+                                        0 <= y < board.grid_height)
+                                   for x, y in board.body)):
+            errors += 1
+
+        if board.done:
+            writer.write(bytes((NEW_GAME,)))
+        elif rng.random() < 0.3:
+            writer.write(bytes((rng.randint(1, len(DIRECTIONS)),)))
+
+    writer.close()
+    return messages, received, errors
+
+
+async def run_bots(host: str, port: int, count: int, seconds: float) -> None:
+    """
+    Connect many bots to a server at once and report what they received.
+
+    :param host: the address of the server.
+    :param port: the port of the server.
+    :param count: the number of bots.
+    :param seconds: how long each bot plays for.
+    """
+    results = await asyncio.gather(*(bot(host, port, seconds,
+                                         random.Random(index))
+                                     for index in range(count)))
+    messages: int = sum(result[0] for result in results)
+    received: int = sum(result[1] for result in results)
+    errors: int = sum(result[2] for result in results)
+
+    print(f"{count} bots for {seconds:.0f} s: {messages} messages, "
+          f"{received} bytes ({received / max(messages, 1):.1f} bytes per "
+          f"message), {errors} inconsistent boards")
+
+
+def main() -> None:
+    settings: Settings = Settings()
+    parser = argparse.ArgumentParser(description="Play on a game server.")
+    parser.add_argument("--host", default=settings.server_host,
+                        help="address of the server")
+    parser.add_argument("--port", type=int, default=settings.server_port,
+                        help="port of the server")
+    parser.add_argument("--bots", type=int, default=0,
+                        help="connect this many random players instead of "
+                        "opening a window")
+    parser.add_argument("--seconds", type=float, default=10,
+                        help="how long the bots play for")
+    args = parser.parse_args()
+
+    if args.bots:
+        asyncio.run(run_bots(args.host, args.port, args.bots, args.seconds))
+    else:
+        play(settings, args.host, args.port)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,12 @@
+import pygame
+
+from engine import UP, DOWN, LEFT, RIGHT
+
+
+# keys for each direction
+DIRECTION_KEYS: dict[int, tuple[int,int]] = {
+    pygame.K_UP: UP, pygame.K_w: UP,
+    pygame.K_DOWN: DOWN, pygame.K_s: DOWN,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+}
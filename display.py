@@ -0,0 +1,152 @@
+import pygame
+from pygame import Surface, Rect
+
+from game_settings import Settings
+
+
+# ways of fitting the game's fixed resolution to the window
+SCALE_MODES: tuple[str, ...] = ("none", "scaled", "integer")
+
+
+class Display:
+    """
+    The window and the surface the game draws on, which always has the
+    fixed logical size of the screen settings. The logical surface is
+    either the window itself, scaled by SDL in the "scaled" mode, or a
+    separate surface scaled up by a whole number with nearest-neighbour
+    sampling and centred in a resizable window in the "integer" mode.
+    Drawing never depends on the window size, only presenting does.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Opens the window.
+
+        :param settings: the game settings.
+        """
+        self.mode: str = settings.scale_mode
+        size: tuple[int,int] = (settings.screen_width,
+                                settings.screen_height)
+
+        # the scale and placement of the logical surface in the window,
+        # and the window size they were worked out for
+        self.scale: int = 1
+        self.area: Rect = Rect((0,0), size)
+        self.window_size: tuple[int,int] = size
+
+        if self.mode == "scaled":
+            self.window: Surface = pygame.display.set_mode(
+                size, pygame.SCALED | pygame.RESIZABLE)
+            self.surface: Surface = self.window
+        elif self.mode == "integer":
+            self.window = pygame.display.set_mode(
+                (size[0] * settings.window_scale,
+                 size[1] * settings.window_scale), pygame.RESIZABLE)
+            self.surface = Surface(size).convert()
+            self.layout()
+        else:
+            self.window = pygame.display.set_mode(size)
+            self.surface = self.window
+
+
+    def layout(self) -> None:
+        """
+        Fit the logical surface to the current window size, using the
+        largest whole-number scale that fits, at least one.
+        """
+        self.window = pygame.display.get_surface()
+        self.window_size = self.window.get_size()
+        window_width, window_height = self.window_size
+        width, height = self.surface.get_size()
+        self.scale = max(1, min(window_width // width,
+                                window_height // height))
+
+        self.area = Rect(0, 0, width * self.scale, height * self.scale)
+        self.area.center = self.window.get_rect().center
+        self.area = self.area.clip(self.window.get_rect())
+
+        # the border around the scaled surface is left black
+        self.window.fill((0,0,0))
+
+
+    def resized(self) -> bool:
+        """
+        Refit the logical surface if the window changed size since it was
+        last fitted.
+
+        :return: whether the window changed size.
+        """
+        if pygame.display.get_surface().get_size() == self.window_size:
+            return False
+        self.layout()
+        return True
+
+
+    def resize(self) -> None:
+        """
+        Refit the logical surface after the window changes size, showing
+        the last frame again without redrawing it.
+        """
+        if self.mode == "integer":
+            self.flip()
+
+
+    def flip(self) -> None:
+        """
+        Show the whole logical surface.
+        """
+        if self.mode == "integer":
+            self.resized()
+            self.scale_area(self.surface.get_rect())
+        pygame.display.flip()
+
+
+    def update(self, rects: list[Rect]) -> None:
+        """
+        Show the changed parts of the logical surface, scaling only those.
+
+        :param rects: the changed areas in logical pixels.
+        """
+        if self.mode != "integer":
+            pygame.display.update(rects)
+            return
+
+        # a window resized since the last frame needs all of the surface
+        if self.resized():
+            self.flip()
+            return
+        pygame.display.update([self.scale_area(rect) for rect in rects])
+
+
+    def scale_area(self, rect: Rect) -> Rect:
+        """
+        Scale part of the logical surface into the window.
+
+        :param rect: the area in logical pixels.
+        :return: the area of the window it was drawn to.
+        """
+        # the part of the window the surface is scaled into, taken afresh
+        # each time as resizing the window replaces its pixels
+        target: Surface = self.window.subsurface(self.area)
+        scaled: Rect = Rect(rect.x * self.scale, rect.y * self.scale,
+                            rect.w * self.scale, rect.h * self.scale)
+        scaled = scaled.clip(target.get_rect())
+
+        # only a window smaller than the surface clips the scaled area, and
+        # then the scale is one
+        source: Rect = Rect(scaled.x // self.scale, scaled.y // self.scale,
+                            scaled.w // self.scale, scaled.h // self.scale)
+        if source.w and source.h:
+            pygame.transform.scale(self.surface.subsurface(source),
+                                   scaled.size, target.subsurface(scaled))
+        return scaled.move(self.area.topleft)
+
+
+    def mouse_pos(self) -> tuple[int,int]:
+        """
+        Return the mouse position in logical pixels.
+        """
+        x, y = pygame.mouse.get_pos()
+        if self.mode != "integer":
+            return x, y
+        return ((x - self.area.x) // self.scale,
+                (y - self.area.y) // self.scale)
@@ -0,0 +1,217 @@
+import random
+
+from game_settings import Settings
+from body import Body
+from items import Items, EMPTY, FRUIT, HAZARD
+
+
+# directions as (column, row) steps
+STOP: tuple[int,int] = (0,0)
+UP: tuple[int,int] = (0,-1)
+DOWN: tuple[int,int] = (0,1)
+LEFT: tuple[int,int] = (-1,0)
+RIGHT: tuple[int,int] = (1,0)
+
+
+def allowed_turn(heading: tuple[int,int], direction: tuple[int,int],
+                 length: int) -> bool:
+    """
+    Check whether the snake may turn to a direction without reversing into
+    itself. A snake of length one may turn anywhere.
+
+    :param heading: the current direction.
+    :param direction: the new direction.
+    :param length: the length of the snake.
+    :return: True if the turn is allowed.
+    """
+    return length == 1 or not (direction[0] and heading[0] or
+                               direction[1] and heading[1])
+
+
+class Engine:
+    """
+    The rules of the game, independent of the display, mixer and disk.
+    Positions are in board cells rather than pixels.
+    """
+    def __init__(self, settings: Settings, seed: int | None = None) -> None:
+        """
+        Initializes an engine and starts the first game.
+
+        :param settings: the game settings.
+        :param seed: the seed for fruit placement, random if None.
+        """
+        self.settings: Settings = settings
+        self.rng: random.Random = random.Random()
+        self.body: Body = Body(settings)
+        self.items: Items = Items(settings)
+
+        # target length of the snake and the number of cells it covers
+        self.length: int = 1
+        self.current_length: int = 1
+
+        self.direction: tuple[int,int] = STOP
+
+        # the most recently spawned fruit, one of those in items
+        self.fruit: tuple[int,int] = (0,0)
+        self.score: int = 0
+        self.ticks: int = 0
+        self.done: bool = False
+
+        self.reset(seed)
+
+
+    def reset(self, seed: int | None = None) -> None:
+        """
+        Start a new game.
+
+        :param seed: the seed for fruit placement, random if None.
+        """
+        # pick a seed even when none is given so every game can be replayed
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.rng.seed(seed)
+        self.seed: int = seed
+
+        # place a single head cell in the middle of the board, clearing the
+        # body after the items so the free cells index starts in order
+        self.clear_items()
+        self.body.clear()
+        self.body.push_head(self.settings.grid_width // 2,
+                            self.settings.grid_height // 2)
+
+        self.length = 1
+        self.current_length = 1
+        self.direction = STOP
+        self.score = 0
+        self.ticks = 0
+        self.done = False
+
+        for _ in range(self.settings.fruit_count):
+            self.spawn_fruit()
+        for _ in range(self.settings.hazard_count):
+            self.spawn_item(HAZARD)
+
+
+    def turn(self, direction: tuple[int,int]) -> bool:
+        """
+        Change direction unless it would reverse the snake into itself.
+
+        :param direction: the new direction.
+        :return: True if the direction was accepted.
+        """
+        if not allowed_turn(self.direction, direction, self.length):
+            return False
+
+        self.direction = direction
+        return True
+
+
+    def step(self, action: tuple[int,int] | None = None) \
+        -> tuple[int, bool, int]:
+        """
+        Advance the game by one tick.
+
+        :param action: a direction to turn to first, or None to keep going.
+        :return: the reward for this tick (1 for a fruit, -1 for dying),
+        whether the game is over and the current score.
+        """
+        if self.done:
+            return 0, True, self.score
+
+        if action is not None:
+            self.turn(action)
+
+        self.ticks += 1
+
+        # get new position
+        head_x, head_y = self.body.head
+        new_x: int = head_x + self.direction[0]
+        new_y: int = head_y + self.direction[1]
+
+        # check for collision with the walls
+        if not self.body.on_board(new_x, new_y):
+            self.done = True
+            return -1, True, self.score
+
+        # delete the tail or grow
+        if self.length == self.current_length:
+            self.body.pop_tail()
+        else:
+            self.current_length += 1
+
+        # check for collision with tail
+        collided: bool = self.body.contains(new_x, new_y)
+
+        # add new head
+        self.body.push_head(new_x, new_y)
+
+        if collided:
+            self.done = True
+            return -1, True, self.score
+
+        # check for an item under the head, whose cell stays out of the free
+        # cells index while the body covers it
+        kind: int = self.items.remove(new_y * self.settings.grid_width +
+                                      new_x)
+        if kind == FRUIT:
+            self.length += 1
+            self.score += 1
+            self.spawn_fruit()
+            return 1, False, self.score
+        if kind == HAZARD:
+            self.done = True
+            return -1, True, self.score
+
+        return 0, False, self.score
+
+
+    def spawn_fruit(self) -> None:
+        """
+        Spawn a fruit in a random free position.
+        """
+        cell: int | None = self.spawn_item(FRUIT)
+        if cell is None:
+            return
+
+        self.fruit = (cell % self.settings.grid_width,
+                      cell // self.settings.grid_width)
+
+
+    def remove_item(self, cell: int) -> int:
+        """
+        Take an item off a cell that is not under the snake, so items can
+        spawn there again.
+
+        :param cell: the index of the cell on the board.
+        :return: the kind of item removed, EMPTY if there was none.
+        """
+        kind: int = self.items.remove(cell)
+        if kind != EMPTY:
+            self.body.free.add(cell)
+        return kind
+
+
+    def clear_items(self) -> None:
+        """
+        Take every item off the board.
+        """
+        for cell in self.items.clear():
+            self.body.free.add(cell)
+
+
+    def spawn_item(self, kind: int) -> int | None:
+        """
+        Place an item on a random free cell.
+
+        :param kind: the kind of item.
+        :return: the index of the cell, or None if the board is full.
+        """
+        # the free cells index holds neither the cells covered by the snake
+        # nor those holding an item, so any cell drawn from it is empty
+        cell: int | None = self.body.free.choice(self.rng)
+        if cell is None:
+            return None
+
+        self.body.free.remove(cell)
+        self.items.add(cell, kind)
+        return cell
@@ -0,0 +1,255 @@
+import argparse
+import mmap
+import os
+import sys
+import tempfile
+from time import perf_counter
+from typing import BinaryIO
+
+# run without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# keep pygame's banner off stdout, where raw frames may be going
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+from pygame import Surface
+
+from game_settings import Settings
+import game_functions as gf
+from ui_handler import UIHandler
+from scene_manager import SceneManager, GAME
+from audio_handler import AudioHandler
+from snake import Snake
+from replay import Replay
+
+
+FORMATS: tuple[str, ...] = ("raw", "mmap", "png")
+
+
+class FrameSource:
+    """
+    An offscreen Surface that frames are drawn onto, laid out when possible
+    as packed RGB bytes so each frame can be written straight from the
+    Surface's own pixels.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Initializes an offscreen Surface.
+
+        :param width: the width in pixels.
+        :param height: the height in pixels.
+        """
+        self.width: int = width
+        self.height: int = height
+        self.frame_size: int = width * height * 3
+
+        # 24 bit pixels with red in the lowest byte are already RGB bytes
+        masks: tuple[int, ...] = (0xFF, 0xFF00, 0xFF0000, 0)
+        if sys.byteorder == "big":
+            masks = (0xFF0000, 0xFF00, 0xFF, 0)
+        self.surface: Surface = Surface((width, height), 0, 24, masks)
+
+        # check the layout, and otherwise copy frames through a reused array
+        self.surface.fill((1, 2, 3))
+        self.packed: bool = self.surface.get_pitch() == width * 3 and \
+            bytes(self.surface.get_view("0"))[:3] == b"\x01\x02\x03"
+        self.buffer: np.ndarray | None = None
+        if not self.packed:
+            self.buffer = np.empty((height, width, 3), np.uint8)
+
+
+    def pixels(self):
+        """
+        Return the RGB bytes of the current frame, as a view of the
+        Surface's pixels if they are packed. The view locks the Surface,
+        so drop it before drawing again.
+
+        :return: an object supporting the buffer protocol.
+        """
+        if self.packed:
+            return self.surface.get_view("0")
+
+        np.copyto(self.buffer,
+                  pygame.surfarray.pixels3d(self.surface).transpose(1, 0, 2))
+        return self.buffer
+
+
+class FrameSink:
+    """
+    Where exported frames are written: raw RGB to a file or pipe, raw RGB
+    into a memory-mapped file, or one PNG per frame.
+    """
+    def __init__(self, kind: str, path: str, source: FrameSource,
+                 max_frames: int) -> None:
+        """
+        Initializes a frame sink.
+
+        :param kind: one of FORMATS.
+        :param path: a file, - for stdout, or a directory for PNGs.
+        :param source: the Surface the frames come from.
+        :param max_frames: the most frames that will be written.
+        """
+        self.kind: str = kind
+        self.path: str = path
+        self.source: FrameSource = source
+        self.frames: int = 0
+
+        self.file: BinaryIO | None = None
+        self.map: mmap.mmap | None = None
+        if kind == "png":
+            os.makedirs(path, exist_ok=True)
+        elif kind == "raw":
+            self.file = sys.stdout.buffer if path == "-" else \
+                open(path, "wb")
+        else:
+            # map room for every frame up front and trim it when closing
+            self.file = open(path, "w+b")
+            self.file.truncate(source.frame_size * max(max_frames, 1))
+            self.map = mmap.mmap(self.file.fileno(), 0)
+
+
+    def write(self) -> None:
+        """
+        Write the frame currently on the source's Surface.
+        """
+        if self.kind == "png":
+            pygame.image.save(self.source.surface,
+                              os.path.join(self.path,
+                                           f"{self.frames:06}.png"))
+        elif self.map is not None:
+            start: int = self.frames * self.source.frame_size
+            self.map[start:start + self.source.frame_size] = \
+                memoryview(self.source.pixels()).cast("B")
+        else:
+            self.file.write(self.source.pixels())
+        self.frames += 1
+
+
+    def close(self) -> None:
+        """
+        Flush and close the output.
+        """
+        if self.map is not None:
+            self.map.close()
+            self.file.truncate(self.frames * self.source.frame_size)
+        if self.file and self.file is not sys.stdout.buffer:
+            self.file.close()
+        elif self.file:
+            self.file.flush()
+
+
+def export(settings: Settings, sink: FrameSink, source: FrameSource,
+           seed: int | None, replay: Replay | None, max_ticks: int,
+           frames_per_tick: int) -> int:
+    """
+    Play a game through the normal drawing code onto an offscreen Surface,
+    writing a frame after each tick and between ticks if asked.
+
+    :param settings: the game settings.
+    :param sink: where to write the frames.
+    :param source: the Surface to draw on.
+    :param seed: the seed of the game when not playing a replay.
+    :param replay: a recorded game to play, or None for the autopilot.
+    :param max_ticks: the most ticks to play.
+    :param frames_per_tick: frames drawn per tick, with the head moving
+    smoothly between cells when more than one.
+    :return: the number of ticks played.
+    """
+    screen: Surface = source.surface
+    scene: SceneManager = SceneManager()
+    scene.switch(GAME)
+    ui: UIHandler = UIHandler(settings, screen, scene)
+    ui.moving = True
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.save_path = os.path.join(directory, "scores.db")
+        audio: AudioHandler = AudioHandler(cache_dir=directory)
+        snake: Snake = Snake(settings, screen, ui, scene, audio)
+        snake.engine.reset(replay.seed if replay else seed)
+        snake.autopilot_active = replay is None
+
+        inputs = iter(replay.inputs if replay else ())
+        next_input: tuple[int, tuple[int,int]] | None = next(inputs, None)
+        if replay:
+            max_ticks = min(max_ticks, replay.ticks)
+
+        gf.update_screen(settings, screen, ui, scene, snake, flip=False)
+        sink.write()
+
+        tick: int = 0
+        while tick < max_ticks and scene.game_screen_active:
+            if next_input and next_input[0] == tick:
+                snake.queue_turn(next_input[1])
+                next_input = next(inputs, None)
+
+            gf.update_game(snake, ui, scene)
+            tick += 1
+
+            for frame in range(1, frames_per_tick + 1):
+                gf.update_screen(settings, screen, ui, scene, snake,
+                                 frame / frames_per_tick, flip=False)
+                sink.write()
+
+        snake.scores.close()
+
+    return tick
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render a game to image "
+                                     "files or raw RGB frames without a "
+                                     "window.")
+    parser.add_argument("--format", choices=FORMATS, default="raw",
+                        help="raw RGB to a file or pipe, raw RGB into a "
+                        "memory-mapped file, or a PNG per frame")
+    parser.add_argument("--out", default="-",
+                        help="output file, - for stdout, or a directory for "
+                        "PNGs")
+    parser.add_argument("--replay", default="",
+                        help="a replay file to render, otherwise the "
+                        "autopilot plays")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the autopilot's game")
+    parser.add_argument("--max-ticks", type=int, default=3000,
+                        help="most ticks to render")
+    parser.add_argument("--frames-per-tick", type=int, default=1,
+                        help="frames drawn per tick")
+    args = parser.parse_args()
+
+    # play a replay on the board, fruits and hazards it was recorded with
+    replay: Replay | None = None
+    settings: Settings = Settings()
+    if args.replay:
+        replay = Replay.load(args.replay)
+        settings = replay.settings()
+        settings.screen_width = replay.grid_width * settings.snake_size
+        settings.screen_height = replay.grid_height * settings.snake_size
+
+    settings.replay_path = ""
+    settings.report_startup = False
+    settings.profiling = False
+
+    pygame.init()
+    source: FrameSource = FrameSource(settings.screen_width,
+                                      settings.screen_height)
+    sink: FrameSink = FrameSink(args.format, args.out, source,
+                                args.max_ticks * args.frames_per_tick + 1)
+
+    start: float = perf_counter()
+    ticks: int = export(settings, sink, source, args.seed, replay,
+                        args.max_ticks, args.frames_per_tick)
+    elapsed: float = perf_counter() - start
+    sink.close()
+
+    print(f"{sink.frames} frames of {source.width}x{source.height} "
+          f"({ticks} ticks) in {elapsed:.2f} s, "
+          f"{sink.frames / elapsed:,.0f} frames/s, "
+          f"{ticks / elapsed / settings.tick_rate:,.0f}x real time",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,89 +7,74 @@ from pygame.event import Event
 from game_settings import Settings
 from snake import Snake
 from ui_handler import UIHandler
-from scene_manager import SceneManager
-from audio_handler import AudioHandler
+from scene_manager import SceneManager, GAME
+from display import Display
 
 
-def check_events(snake: Snake, ui: UIHandler, scene: SceneManager,
-                 audio: AudioHandler) -> None:
+def filter_events(ui: UIHandler) -> None:
     """
-    Handle user input events.
+    Block every event type the game does not handle, such as mouse motion,
+    so idle scenes are not woken by them.
 
-    :param snake: the snake game object.
     :param ui: a reference to the ui handler.
-    :param scene: a reference to the screen manager.
-    :param audio: a reference to the audio handler.
     """
-    for event in pygame.event.get():
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed((pygame.QUIT, pygame.KEYDOWN,
+                              pygame.MOUSEBUTTONDOWN, pygame.WINDOWEXPOSED,
+                              pygame.VIDEORESIZE, ui.BLINKEVENT))
+
+
+def wait_events(timeout: int) -> list[Event]:
+    """
+    Sleep until an event arrives or the timeout passes.
+
+    :param timeout: the longest wait in milliseconds.
+    :return: the events that arrived, if any.
+    """
+    event: Event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+def check_events(events: list[Event], snake: Snake, scene: SceneManager,
+                 display: Display) -> None:
+    """
+    Handle user input events, passing all but quitting and resizing the
+    window to the current scene.
+
+    :param events: the events to handle.
+    :param snake: the snake game object.
+    :param scene: a reference to the scene manager.
+    :param display: the display the game is shown on.
+    """
+    for event in events:
         # close window
         if event.type == pygame.QUIT:
+            report_latency(snake)
             sys.exit()
 
-        # handle key presses
-        elif event.type == pygame.KEYDOWN:
-            check_keydown_events(event, snake, ui, scene, audio)
-
-        # handle blinking text
-        elif not scene.game_screen_active and event.type == ui.BLINKEVENT:
-            ui.play_current = next(ui.play_blinker)
+        # fit the last frame to the new window size
+        elif event.type == pygame.VIDEORESIZE:
+            display.resize()
+            continue
 
-        # start screen play button
-        elif event.type == pygame.MOUSEBUTTONDOWN and \
-              scene.start_screen_active:
-            if ui.start_hover:
-                scene.start_screen_active = False
-                scene.game_screen_active = True
-                audio.action_sound.play()
+        scene.current.handle_event(event)
+        scene.dirty = True
 
 
-def check_keydown_events(event: Event, snake: Snake, ui: UIHandler,
-                         scene: SceneManager, audio: AudioHandler) -> None:
+def report_latency(snake: Snake) -> None:
     """
-    Handle key presses.
+    Print percentiles of the delay between a key press and the tick that
+    moved the snake in that direction.
 
-    :param event: the input event.
     :param snake: the snake game object.
-    :param ui: a reference to the ui handler.
-    :param scene: a reference to the scene manager.
-    :param audio: a reference to the audio handler.
     """
-    # gameplay controls
-    if scene.game_screen_active and not scene.game_paused:
-        if event.key in (pygame.K_UP, pygame.K_w) and \
-            (not snake.speed_y or snake.length == 1):
-            ui.moving = True
-            snake.speed_x = 0
-            snake.speed_y = -snake.size
-            audio.move_sound.play()
-        elif event.key in (pygame.K_DOWN, pygame.K_s)and \
-            (not snake.speed_y or snake.length == 1):
-            ui.moving = True
-            snake.speed_x = 0
-            snake.speed_y = snake.size
-            audio.move_sound.play()
-        elif event.key in (pygame.K_RIGHT, pygame.K_d)and \
-            (not snake.speed_x or snake.length == 1):
-            ui.moving = True
-            snake.speed_x = snake.size
-            snake.speed_y = 0
-            audio.move_sound.play()
-        elif event.key in (pygame.K_LEFT, pygame.K_a) and \
-            (not snake.speed_x or snake.length == 1):
-            ui.moving = True
-            snake.speed_x = -snake.size
-            snake.speed_y = 0
-            audio.move_sound.play()
-    
-    # pause game
-    if event.key == pygame.K_ESCAPE and scene.game_screen_active:
-        audio.action_sound.play()
-        scene.game_paused = not scene.game_paused
-
-    # play again after losing
-    if scene.end_screen_active and event.key == pygame.K_p:
-        audio.action_sound.play()
-        reset_game(ui, scene, snake)
+    percentiles: dict[int, float] = snake.inputs.latency_percentiles()
+    if percentiles:
+        print("key-to-move latency: " +
+              ", ".join(f"p{percent} {latency:.1f} ms"
+                        for percent, latency in percentiles.items()))
 
 
 def reset_game(ui: UIHandler, scene: SceneManager, snake: Snake) -> None:
@@ -105,12 +90,26 @@ def reset_game(ui: UIHandler, scene: SceneManager, snake: Snake) -> None:
     #reset the snake
     snake.reset_snake()
     # change scenes
-    scene.end_screen_active = False
-    scene.game_screen_active = True
+    scene.switch(GAME)
+
+
+def update_game(snake: Snake, ui: UIHandler, scene: SceneManager) -> None:
+    """
+    Advance the active scene by one tick.
+
+    :param snake: the snake game object.
+    :param ui: a reference to the ui handler.
+    :param scene: a reference to the scene manager.
+    """
+    if scene.start_screen_active:
+        ui.update_start_animation()
+    elif scene.game_screen_active and not scene.game_paused:
+        snake.update()
 
 
 def update_screen(settings: Settings, screen: Surface, ui: UIHandler,
-                  scene: SceneManager, snake: Snake) -> None:
+                  scene: SceneManager, snake: Snake,
+                  alpha: float = 1.0, flip: bool = True) -> None:
     """
     Update the screen.
 
@@ -119,9 +118,14 @@ def update_screen(settings: Settings, screen: Surface, ui: UIHandler,
     :param ui: a reference to the ui handler.
     :param scene: a reference to the scene manager.
     :param snake: the snake game object.
+    :param alpha: how far the head has moved towards its current cell.
+    :param flip: whether to show the frame, off when drawing offscreen.
     """
     screen.fill(settings.bg_color)
     ui.draw_ui()
     if scene.game_screen_active:
-        snake.draw_snake()
-    pygame.display.flip()
\ No newline at end of file
+        snake.draw_snake(alpha)
+    if ui.show_profiler:
+        ui.display_profiler()
+    if flip:
+        pygame.display.flip()
\ No newline at end of file
@@ -6,12 +6,107 @@ class Settings:
         self.screen_width: int = 300
         self.screen_height: int  = 200
 
+        # the game is always drawn at the screen size, then shown as it is
+        # ("none"), scaled to a resizable window by SDL ("scaled"), or
+        # scaled by the largest whole number that fits a resizable window
+        # ("integer"), which opens at this many times the screen size
+        self.scale_mode: str = "none"
+        self.window_scale: int = 3
+
         # game colors
         self.bg_color: tuple[int,int,int] = (240,240,200)
         self.head_color: tuple[int,int,int] = (50,100,50)
         self.body_color: tuple[int,int,int] = (50,200,100)
         self.fruit_color: tuple[int,int,int] = (200,100,100)
+        self.hazard_color: tuple[int,int,int] = (60,60,60)
         self.score_color: tuple[int,int,int] = (200,200,160)
 
+        # font file for menu text
+        self.menu_font: str = "fonts/ARCADE.TTF"
+
         # snake dimensions
         self.snake_size: int = 10
+
+        # play on a board larger than the window, with a camera following
+        # the head and the body indexed in square chunks of cells; change
+        # it with use_large_world so the board size follows
+        self.large_world: bool = False
+        self.world_width: int = 2000
+        self.world_height: int = 2000
+        self.chunk_size: int = 16
+
+        # board dimensions in cells, and the number of cells along each
+        # edge where fruit never spawns
+        self.grid_width: int = self.screen_width // self.snake_size
+        self.grid_height: int = self.screen_height // self.snake_size
+        self.use_large_world(self.large_world)
+        self.fruit_margin: int = 1
+
+        # fruits on the board at once, each replaced as soon as it is
+        # eaten, and hazards that end the game when hit
+        self.fruit_count: int = 1
+        self.hazard_count: int = 0
+
+        # only redraw the cells that changed during gameplay
+        self.dirty_rendering: bool = True
+
+        # run the game at a fixed number of ticks per second, drawing and
+        # polling input at a separate frame rate (0 for uncapped), with a
+        # limit on the ticks run in one frame so slow frames can catch up
+        # without spiraling
+        self.fixed_timestep: bool = True
+        self.tick_rate: int = 10
+        self.frame_rate: int = 60
+        self.max_ticks_per_frame: int = 5
+
+        # on scenes that only change on input or timers, such as the end
+        # screen and the pause screen, sleep until an event arrives, waking
+        # at least this often in milliseconds
+        self.idle_wait: bool = True
+        self.idle_timeout: int = 1000
+
+        # direction changes that can wait for upcoming ticks
+        self.input_queue_size: int = 3
+
+        # seconds of play kept to rewind through with R, 0 to turn rewinding
+        # off, and how far back each press goes
+        self.rewind_seconds: int = 10
+        self.rewind_step: int = 3
+
+        # leaderboard database
+        self.save_path: str = "save_data/scores.db"
+
+        # where the last game is recorded for playback, empty to disable
+        self.replay_path: str = "save_data/last_game.replay"
+
+        # print how long each phase of startup takes
+        self.report_startup: bool = True
+
+        # time every frame, with an overlay toggled by F3, keeping this many
+        # recent frames and streaming all of them to a CSV file if set
+        self.profiling: bool = True
+        self.profiler_samples: int = 240
+        self.profiler_csv: str = ""
+
+        # start games with the autopilot steering, toggled by tab
+        self.autopilot: bool = False
+
+        # address the network server listens on and clients connect to
+        self.server_host: str = "127.0.0.1"
+        self.server_port: int = 5757
+
+
+    def use_large_world(self, large_world: bool = True) -> None:
+        """
+        Switch between the large world and a board the size of the window,
+        setting the board dimensions to match.
+
+        :param large_world: whether to play on the large world.
+        """
+        self.large_world = large_world
+        if large_world:
+            self.grid_width = self.world_width
+            self.grid_height = self.world_height
+        else:
+            self.grid_width = self.screen_width // self.snake_size
+            self.grid_height = self.screen_height // self.snake_size
@@ -0,0 +1,95 @@
+from array import array
+from collections import deque
+from time import perf_counter
+
+from engine import allowed_turn
+
+
+class InputQueue:
+    """
+    A bounded queue of direction changes, consumed one per tick so quick
+    key presses within a single tick are all played in order. Each input
+    is timestamped to measure the delay until the head moves.
+    """
+    def __init__(self, size: int = 3, samples: int = 1000) -> None:
+        """
+        Initializes an empty input queue.
+
+        :param size: the maximum number of queued inputs.
+        :param samples: the number of latency measurements to keep.
+        """
+        self.size: int = size
+        self.inputs: deque[tuple[tuple[int,int], float]] = deque()
+
+        # delays in milliseconds between a key press and its tick, in a
+        # ring buffer of unboxed floats so recording one allocates nothing
+        self.samples: int = samples
+        self.latencies: array = array("d", [0.0]) * samples
+        self.measured: int = 0
+
+
+    def push(self, direction: tuple[int,int], heading: tuple[int,int],
+             length: int) -> bool:
+        """
+        Queue a direction change if it is valid after the inputs already
+        queued.
+
+        :param direction: the new direction.
+        :param heading: the current direction of the snake.
+        :param length: the length of the snake.
+        :return: True if the input was queued.
+        """
+        if self.inputs:
+            heading = self.inputs[-1][0]
+
+        if len(self.inputs) == self.size or direction == heading or \
+            not allowed_turn(heading, direction, length):
+            return False
+
+        self.inputs.append((direction, perf_counter()))
+        return True
+
+
+    def pop(self, measure: bool = True) -> tuple[int,int] | None:
+        """
+        Take the next direction change, recording how long it waited.
+
+        :param measure: whether to record the latency, off for inputs that
+        do not come from a player.
+        :return: the direction, or None if the queue is empty.
+        """
+        if not self.inputs:
+            return None
+
+        direction, time = self.inputs.popleft()
+        if measure:
+            self.latencies[self.measured % self.samples] = \
+                (perf_counter() - time) * 1000
+            self.measured += 1
+        return direction
+
+
+    def clear(self) -> None:
+        """
+        Drop all queued inputs.
+        """
+        self.inputs.clear()
+
+
+    def latency_percentiles(self, percents: tuple[int, ...] = (50, 90, 99)) \
+        -> dict[int, float]:
+        """
+        Return percentiles of the recorded key-to-move latencies.
+
+        :param percents: the percentiles to compute.
+        :return: a mapping of each percentile to a latency in milliseconds,
+        empty if nothing has been recorded.
+        """
+        if not self.measured:
+            return {}
+
+        ordered: list[float] = sorted(
+            self.latencies[:min(self.measured, self.samples)])
+        last: int = len(ordered) - 1
+        return {percent: ordered[round(last * percent / 100)]
+                for percent in percents}
@@ -0,0 +1,131 @@
+from array import array
+
+from game_settings import Settings
+
+
+# kinds of item, stored as one byte per board cell
+EMPTY: int = 0
+FRUIT: int = 1
+HAZARD: int = 2
+KINDS: int = 3
+
+
+class Items:
+    """
+    The fruits and hazards on the board, indexed by cell so that finding
+    the item under the head, adding one and removing one are all constant
+    time however many there are. The cells of each kind are also kept in a
+    packed array, with a reverse lookup of each cell's position in it, so
+    all items of a kind can be drawn in a single batch.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes an empty item store.
+
+        :param settings: a reference to the game settings.
+        """
+        self.grid_width: int = settings.grid_width
+        cells: int = settings.grid_width * settings.grid_height
+
+        # the kind of item on each board cell, and its position in the
+        # packed array of its kind
+        self.kinds: bytearray = bytearray(cells)
+        self.positions: array = array("i", [-1]) * cells
+
+        # the cells holding each kind of item, the first for EMPTY unused
+        self.cells: tuple[array, ...] = tuple(array("i")
+                                              for _ in range(KINDS))
+
+        # running total of items added, used by the renderer to find the
+        # items added since the last frame
+        self.added: int = 0
+
+
+    def __len__(self) -> int:
+        """
+        Return the number of items on the board.
+        """
+        return sum(len(cells) for cells in self.cells)
+
+
+    def count(self, kind: int) -> int:
+        """
+        Return the number of items of a kind.
+
+        :param kind: the kind of item.
+        """
+        return len(self.cells[kind])
+
+
+    def add(self, cell: int, kind: int) -> None:
+        """
+        Place an item on an empty cell.
+
+        :param cell: the index of the cell on the board.
+        :param kind: the kind of item.
+        """
+        cells: array = self.cells[kind]
+        self.kinds[cell] = kind
+        self.positions[cell] = len(cells)
+        cells.append(cell)
+        self.added += 1
+
+
+    def remove(self, cell: int) -> int:
+        """
+        Take the item off a cell by swapping it with the last item of its
+        kind.
+
+        :param cell: the index of the cell on the board.
+        :return: the kind of item removed, EMPTY if there was none.
+        """
+        kind: int = self.kinds[cell]
+        if kind == EMPTY:
+            return EMPTY
+
+        cells: array = self.cells[kind]
+        position: int = self.positions[cell]
+        last: int = cells.pop()
+        if last != cell:
+            cells[position] = last
+            self.positions[last] = position
+
+        self.kinds[cell] = EMPTY
+        self.positions[cell] = -1
+        return kind
+
+
+    def clear(self) -> list[int]:
+        """
+        Remove every item.
+
+        :return: the cells that held an item.
+        """
+        removed: list[int] = []
+        for cells in self.cells:
+            for cell in cells:
+                self.kinds[cell] = EMPTY
+                self.positions[cell] = -1
+            removed.extend(cells)
+            del cells[:]
+        return removed
+
+
+    def visible(self, left: int, top: int, right: int, bottom: int):
+        """
+        Iterate over the items inside an area of the board, scanning its
+        rows of the kind bitmap rather than every item.
+
+        :param left: the first column.
+        :param top: the first row.
+        :param right: the column after the last.
+        :param bottom: the row after the last.
+        """
+        for y in range(top, bottom):
+            start: int = y * self.grid_width
+            row: bytearray = self.kinds[start + left:start + right]
+            if not row.strip(b"\x00"):
+                continue
+            for x, kind in enumerate(row, left):
+                if kind:
+                    yield x, y, kind
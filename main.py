@@ -1,44 +1,129 @@
 import pygame
 from pygame import Surface
+from pygame.event import Event
 from pygame.time import Clock
 
 from game_settings import Settings
 import game_functions as gf
 from ui_handler import UIHandler
-from scene_manager import SceneManager
+from scene_manager import Scene, SceneManager, START, GAME, END
+from scenes import StartScene, PlayScene, EndScene
 from audio_handler import AudioHandler
 from snake import Snake
+from renderer import Renderer
+from display import Display
+from startup_timer import StartupTimer
+from profiler import FrameProfiler, WAIT, EVENTS, UPDATE, DRAW
 
 
 def run_game() -> None:
+    settings: Settings = Settings()
+    timer: StartupTimer = StartupTimer(settings.report_startup)
+
     # initialize window
     pygame.init()
     pygame.display.set_caption("Snake")
+    timer.mark("pygame init")
 
-    # set up game settings, clock, screen, scene manager and audio and
-    # ui handlers
-    settings: Settings = Settings()
-    screen: Surface = pygame.display.set_mode((settings.screen_width,
-                                               settings.screen_height))
+    # set up clock, screen, scene manager and audio and ui handlers, with
+    # the sounds decoding in the background
+    display: Display = Display(settings)
+    screen: Surface = display.surface
+    timer.mark("window")
     scene_manager: SceneManager = SceneManager()
     ui_handler: UIHandler = UIHandler(settings, screen, scene_manager)
-    audio_handler: AudioHandler = AudioHandler()
+    ui_handler.display = display
+    timer.mark("fonts")
+    audio_handler: AudioHandler = AudioHandler(
+        lambda duration: timer.record("sounds (background)", duration))
+    timer.mark("mixer")
     clock: Clock = pygame.time.Clock()
 
     # create snake game object
     snake: Snake = Snake(settings, screen, ui_handler, scene_manager,
                          audio_handler)
+    renderer: Renderer = Renderer(settings, screen, ui_handler,
+                                  scene_manager, snake, display)
+    timer.mark("game objects")
+
+    # the scenes, each drawing through the renderer
+    for name, scene_class in ((START, StartScene), (GAME, PlayScene),
+                              (END, EndScene)):
+        scene_manager.add(name, scene_class(settings, screen, ui_handler,
+                                            scene_manager, snake,
+                                            audio_handler, renderer))
+    gf.filter_events(ui_handler)
+
+    # time each phase of every frame
+    profiler: FrameProfiler | None = None
+    if settings.profiling:
+        profiler = FrameProfiler(settings.profiler_samples,
+                                 settings.profiler_csv)
+        ui_handler.profiler = profiler
+
+    # show the start screen straight away
+    scene_manager.current.draw()
+    scene_manager.dirty = False
+    timer.mark("first frame")
+
+    # time in milliseconds between ticks and not yet simulated
+    tick_time: float = 1000 / settings.tick_rate
+    accumulator: float = 0.0
 
     # game loop
     while True:
-        clock.tick(snake.size)
-        gf.check_events(snake, ui_handler, scene_manager, audio_handler)
+        # report startup phases that finished on background threads
+        timer.report_pending()
+
+        # sleep until an event arrives on scenes that only change on events,
+        # dropping the time spent waiting so no ticks pile up
+        if settings.idle_wait and scene_manager.current.is_static():
+            events: list[Event] = gf.wait_events(settings.idle_timeout)
+            clock.tick()
+            accumulator = 0.0
+        else:
+            if settings.fixed_timestep:
+                accumulator += clock.tick(settings.frame_rate)
+            else:
+                clock.tick(snake.size)
+                accumulator = tick_time
+            events = pygame.event.get()
+        if profiler:
+            profiler.lap(WAIT)
+
+        gf.check_events(events, snake, scene_manager, display)
+        if profiler:
+            profiler.lap(EVENTS)
+
+        # run the ticks that are due, dropping any left over after the
+        # limit so a slow frame does not make the next one slower
+        ticks: int = 0
+        while accumulator >= tick_time:
+            if ticks == settings.max_ticks_per_frame:
+                accumulator = 0.0
+                break
+            scene_manager.current.update()
+            accumulator -= tick_time
+            ticks += 1
+        if profiler:
+            profiler.lap(UPDATE)
 
-        if scene_manager.game_screen_active	and not scene_manager.game_paused:
-            snake.update()
+        # how far the head is between the last tick and the next
+        alpha: float = accumulator / tick_time if \
+                       settings.fixed_timestep else 1.0
+        if scene_manager.game_paused or \
+            not scene_manager.game_screen_active:
+            alpha = 1.0
 
-        gf.update_screen(settings, screen, ui_handler, scene_manager, snake)
+        # draw only scenes that have changed, or move every frame
+        scene: Scene = scene_manager.current
+        if scene_manager.dirty or scene.animates() or ui_handler.show_profiler:
+            scene.draw(alpha)
+            scene_manager.dirty = False
+        if profiler:
+            profiler.lap(DRAW)
+            profiler.end_frame()
 
 
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    run_game()
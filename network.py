@@ -0,0 +1,152 @@
+import struct
+from collections import deque
+
+from engine import Engine, UP, DOWN, LEFT, RIGHT
+
+
+# client to server: one byte per input, a direction as 1-4 or 0 to start
+# a new game once the last one is over
+NEW_GAME: int = 0
+DIRECTIONS: tuple[tuple[int,int], ...] = (UP, DOWN, LEFT, RIGHT)
+
+# server to client: a type byte, then the message
+START: int = 0
+TICK: int = 1
+
+# a new game: the board size, the head and the fruit
+START_MESSAGE: struct.Struct = struct.Struct("<BHHHHHH")
+
+# a tick: a byte of flags for what changed, followed by the new head and
+# the new fruit when they are flagged
+TICK_MESSAGE: struct.Struct = struct.Struct("<BB")
+CELL: struct.Struct = struct.Struct("<HH")
+HEAD_MOVED: int = 1
+TAIL_DROPPED: int = 2
+FRUIT_MOVED: int = 4
+GAME_OVER: int = 8
+SCORED: int = 16
+
+
+def encode_start(engine: Engine) -> bytes:
+    """
+    Encode the state of a game that has just started.
+
+    :param engine: the game.
+    :return: the message.
+    """
+    head_x, head_y = engine.body.head
+    return START_MESSAGE.pack(START, engine.settings.grid_width,
+                              engine.settings.grid_height, head_x, head_y,
+                              *engine.fruit)
+
+
+def encode_tick(engine: Engine, pushed: int, popped: int,
+                fruit: tuple[int,int], score: int) -> bytes:
+    """
+    Encode what changed in a game during a tick.
+
+    :param engine: the game after the tick.
+    :param pushed: the number of heads pushed before the tick.
+    :param popped: the number of tails popped before the tick.
+    :param fruit: the fruit before the tick.
+    :param score: the score before the tick.
+    :return: the message, or empty if nothing changed.
+    """
+    flags: int = 0
+    data: bytes = b""
+    if engine.body.pushed != pushed:
+        flags |= HEAD_MOVED
+        data += CELL.pack(*engine.body.head)
+    if engine.body.popped != popped:
+        flags |= TAIL_DROPPED
+    if engine.fruit != fruit:
+        flags |= FRUIT_MOVED
+        data += CELL.pack(*engine.fruit)
+    if engine.score != score:
+        flags |= SCORED
+    if engine.done:
+        flags |= GAME_OVER
+
+    if not flags:
+        return b""
+    return TICK_MESSAGE.pack(TICK, flags) + data
+
+
+class RemoteBoard:
+    """
+    A copy of a game on the server, rebuilt from the messages it sends.
+    """
+    def __init__(self) -> None:
+        """
+        Initializes an empty board.
+        """
+        self.grid_width: int = 0
+        self.grid_height: int = 0
+
+        # cells of the snake from head to tail
+        self.body: deque[tuple[int,int]] = deque()
+        self.fruit: tuple[int,int] = (0,0)
+        self.score: int = 0
+        self.done: bool = False
+        self.started: bool = False
+
+        # bytes received but not yet making up a whole message
+        self.buffer: bytearray = bytearray()
+
+
+    def feed(self, data: bytes) -> int:
+        """
+        Apply every complete message in the received data.
+
+        :param data: bytes received from the server.
+        :return: the number of messages applied.
+        """
+        self.buffer += data
+        offset: int = 0
+        messages: int = 0
+
+        while offset < len(self.buffer):
+            if self.buffer[offset] == START:
+                if len(self.buffer) - offset < START_MESSAGE.size:
+                    break
+                _, self.grid_width, self.grid_height, head_x, head_y, \
+                    fruit_x, fruit_y = START_MESSAGE.unpack_from(self.buffer,
+                                                                 offset)
+                offset += START_MESSAGE.size
+
+                self.body.clear()
+                self.body.append((head_x, head_y))
+                self.fruit = (fruit_x, fruit_y)
+                self.score = 0
+                self.done = False
+                self.started = True
+
+            else:
+                if len(self.buffer) - offset < TICK_MESSAGE.size:
+                    break
+                flags: int = self.buffer[offset + 1]
+                size: int = TICK_MESSAGE.size + CELL.size * \
+                    (bool(flags & HEAD_MOVED) + bool(flags & FRUIT_MOVED))
+                if len(self.buffer) - offset < size:
+                    break
+                offset += TICK_MESSAGE.size
+
+                # the tail leaves before the head moves, as in the engine
+                if flags & TAIL_DROPPED:
+                    self.body.pop()
+                if flags & HEAD_MOVED:
+                    self.body.appendleft(CELL.unpack_from(self.buffer,
+                                                          offset))
+                    offset += CELL.size
+                if flags & FRUIT_MOVED:
+                    self.fruit = CELL.unpack_from(self.buffer, offset)
+                    offset += CELL.size
+                if flags & SCORED:
+                    self.score += 1
+                if flags & GAME_OVER:
+                    self.done = True
+
+            messages += 1
+
+        del self.buffer[:offset]
+        return messages
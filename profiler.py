@@ -0,0 +1,115 @@
+import atexit
+from time import perf_counter
+from typing import TextIO
+
+
+# the phases of a frame, in the order the game loop runs them
+PHASES: tuple[str, ...] = ("wait", "events", "update", "draw")
+WAIT, EVENTS, UPDATE, DRAW = range(len(PHASES))
+
+
+class FrameProfiler:
+    """
+    Times each phase of every frame, keeping the most recent frames in a
+    fixed-size ring buffer and optionally streaming every frame to a CSV
+    file.
+    """
+    def __init__(self, samples: int = 240, csv_path: str = "") -> None:
+        """
+        Initializes a frame profiler.
+
+        :param samples: the number of recent frames to keep.
+        :param csv_path: a file to write every frame to, or empty for none.
+        """
+        self.samples: int = samples
+
+        # phase times of recent frames in milliseconds, one row per phase
+        self.times: list[list[float]] = [[0.0] * samples for _ in PHASES]
+        self.totals: list[float] = [0.0] * samples
+        self.frames: int = 0
+
+        # phase times of the frame in progress
+        self.current: list[float] = [0.0] * len(PHASES)
+        self.last: float = perf_counter()
+
+        self.csv: TextIO | None = None
+        if csv_path:
+            self.csv = open(csv_path, "w")
+            self.csv.write("frame," + ",".join(f"{phase}_ms"
+                                               for phase in PHASES) +
+                           ",total_ms\n")
+            atexit.register(self.csv.close)
+
+
+    def lap(self, phase: int) -> None:
+        """
+        Record the time since the previous lap as a phase of this frame.
+
+        :param phase: the index of the phase in PHASES.
+        """
+        now: float = perf_counter()
+        self.current[phase] = (now - self.last) * 1000
+        self.last = now
+
+
+    def end_frame(self) -> None:
+        """
+        Store the timings of the frame in progress.
+        """
+        index: int = self.frames % self.samples
+        total: float = 0.0
+        for phase, time in enumerate(self.current):
+            self.times[phase][index] = time
+            total += time
+        self.totals[index] = total
+
+        if self.csv:
+            self.csv.write(f"{self.frames}," +
+                           ",".join(f"{time:.3f}" for time in self.current) +
+                           f",{total:.3f}\n")
+
+        self.frames += 1
+
+
+    def recent(self) -> list[float]:
+        """
+        Return the total times of the recorded frames still in the buffer.
+        """
+        return self.totals[:min(self.frames, self.samples)]
+
+
+    def percentile(self, percent: float) -> float:
+        """
+        Return a percentile of recent frame times.
+
+        :param percent: the percentile, from 0 to 100.
+        :return: the frame time in milliseconds.
+        """
+        recent: list[float] = sorted(self.recent())
+        if not recent:
+            return 0.0
+        return recent[round((len(recent) - 1) * percent / 100)]
+
+
+    def fps(self) -> float:
+        """
+        Return the average frame rate over recent frames.
+        """
+        recent: list[float] = self.recent()
+        total: float = sum(recent)
+        return len(recent) * 1000 / total if total else 0.0
+
+
+    def histogram(self, bins: int, limit: float) -> list[int]:
+        """
+        Count recent frames by frame time.
+
+        :param bins: the number of equal-width bins.
+        :param limit: the frame time of the top of the last bin in
+        milliseconds, longer frames are counted in the last bin.
+        :return: the number of frames in each bin.
+        """
+        counts: list[int] = [0] * bins
+        for time in self.recent():
+            counts[min(int(time / limit * bins), bins - 1)] += 1
+        return counts
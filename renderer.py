@@ -0,0 +1,189 @@
+import pygame
+from pygame import Surface, Rect
+
+from game_settings import Settings
+from ui_handler import UIHandler
+from scene_manager import SceneManager
+from snake import Snake
+from items import Items
+from display import Display
+
+
+class Renderer:
+    """
+    Draws the game, pushing only the cells that changed since the last
+    frame to the display during gameplay. Scene changes, score changes and
+    pausing fall back to a full redraw.
+    """
+    def __init__(self, settings: Settings, screen: Surface, ui: UIHandler,
+                 scene: SceneManager, snake: Snake,
+                 display: Display | None = None) -> None:
+        """
+        Initializes a renderer.
+
+        :param settings: the game settings.
+        :param screen: the screen.
+        :param ui: a reference to the ui handler.
+        :param scene: a reference to the scene manager.
+        :param snake: the snake game object.
+        :param display: the display the screen belongs to, if it is not
+        the window itself.
+        """
+        self.settings: Settings = settings
+        self.screen: Surface = screen
+        self.ui: UIHandler = ui
+        self.scene: SceneManager = scene
+        self.snake: Snake = snake
+        self.display: Display | None = display
+        self.size: int = settings.snake_size
+
+        # the screen without the snake or fruit, used to erase cells
+        self.background: Surface = screen.copy()
+
+        # what was on screen after the last frame
+        self.drawn_state: tuple | None = None
+        self.drawn_pushed: int = 0
+        self.drawn_popped: int = 0
+        self.drawn_fruit: tuple[int,int] = (0,0)
+        self.drawn_items: int = 0
+        self.drawn_undone: int = 0
+        self.drawn_head: Rect = Rect(0,0,0,0)
+
+        # regions of the screen changed during the current frame
+        self.dirty: list[Rect] = []
+
+
+    def draw(self, alpha: float = 1.0) -> None:
+        """
+        Update the screen.
+
+        :param alpha: how far the head has moved towards its current cell.
+        """
+        state: tuple = (self.scene.start_screen_active,
+                        self.scene.game_screen_active,
+                        self.scene.end_screen_active,
+                        self.scene.game_paused,
+                        self.ui.moving, self.ui.score)
+
+        # menus animate every frame, pausing and the profiler draw overlays
+        # and a moving camera shifts every cell, so redraw the whole screen
+        # unless nothing but the snake and fruit moved, or always when dirty
+        # rendering is turned off or the game was rewound
+        if not self.settings.dirty_rendering or \
+            self.snake.body.undone != self.drawn_undone or \
+            state != self.drawn_state or not self.scene.game_screen_active \
+            or self.ui.show_profiler or self.snake.camera or \
+            not self.draw_changes(alpha):
+            self.draw_full(alpha)
+
+        self.drawn_state = state
+        self.drawn_pushed = self.snake.body.pushed
+        self.drawn_popped = self.snake.body.popped
+        self.drawn_fruit = self.snake.fruit
+        self.drawn_items = self.snake.engine.items.added
+        self.drawn_undone = self.snake.body.undone
+        self.drawn_head = self.snake.head_rect(alpha)
+
+
+    def draw_full(self, alpha: float = 1.0) -> None:
+        """
+        Redraw the whole screen.
+
+        :param alpha: how far the head has moved towards its current cell.
+        """
+        self.screen.fill(self.settings.bg_color)
+        self.ui.draw_ui()
+        self.background.blit(self.screen, (0,0))
+
+        if self.scene.game_screen_active:
+            self.snake.draw_snake(alpha)
+        if self.ui.show_profiler:
+            self.ui.display_profiler()
+
+        if self.display:
+            self.display.flip()
+        else:
+            pygame.display.flip()
+
+
+    def draw_changes(self, alpha: float) -> bool:
+        """
+        Redraw the cells that changed since the last frame.
+
+        :param alpha: how far the head has moved towards its current cell.
+        :return: False if the changes could not be found and the whole
+        screen needs redrawing.
+        """
+        # nothing moves while paused
+        if self.scene.game_paused:
+            return True
+
+        body = self.snake.body
+        new_cells: int = body.pushed - self.drawn_pushed
+        old_cells: int = body.popped - self.drawn_popped
+
+        # removed cells past the tail may have been overwritten, and only
+        # the most recently added item is known
+        items: Items = self.snake.engine.items
+        if body.count + old_cells > body.capacity or \
+            items.added - self.drawn_items > 1:
+            return False
+
+        self.dirty.clear()
+
+        # erase the removed tail cells, the old fruit and the old head
+        for offset in range(body.count, body.count + old_cells):
+            self.erase_cell(*body.cell(offset))
+        # the old fruit may still be on the board if another one was eaten
+        if self.snake.fruit != self.drawn_fruit:
+            fruit_x: int = self.drawn_fruit[0] // self.size
+            fruit_y: int = self.drawn_fruit[1] // self.size
+            if not body.on_board(fruit_x, fruit_y) or \
+                not items.kinds[fruit_y * body.grid_width + fruit_x]:
+                self.erase_cell(fruit_x, fruit_y)
+        self.screen.blit(self.background, self.drawn_head, self.drawn_head)
+        self.dirty.append(self.drawn_head)
+
+        # draw the fruit, the cells the old head covered that are now part
+        # of the body, and the head
+        fruit_rect: Rect = Rect(self.snake.fruit, (self.size, self.size))
+        self.screen.fill(self.settings.fruit_color, fruit_rect)
+        self.dirty.append(fruit_rect)
+
+        for offset in range(1, min(new_cells + 2, body.count)):
+            self.fill_cell(*body.cell(offset), self.settings.body_color)
+
+        head_rect: Rect = self.snake.head_rect(alpha)
+        self.screen.fill(self.settings.head_color, head_rect)
+        self.dirty.append(head_rect)
+
+        if self.display:
+            self.display.update(self.dirty)
+        else:
+            pygame.display.update(self.dirty)
+        return True
+
+
+    def erase_cell(self, x: int, y: int) -> None:
+        """
+        Restore the background of a cell.
+
+        :param x: the column of the cell.
+        :param y: the row of the cell.
+        """
+        rect: Rect = Rect(x * self.size, y * self.size, self.size, self.size)
+        self.screen.blit(self.background, rect, rect)
+        self.dirty.append(rect)
+
+
+    def fill_cell(self, x: int, y: int, color: tuple[int,int,int]) -> None:
+        """
+        Fill a cell with a color.
+
+        :param x: the column of the cell.
+        :param y: the row of the cell.
+        :param color: the fill color.
+        """
+        rect: Rect = Rect(x * self.size, y * self.size, self.size, self.size)
+        self.screen.fill(color, rect)
+        self.dirty.append(rect)
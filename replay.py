@@ -0,0 +1,231 @@
+import argparse
+import os
+import struct
+import sys
+from time import perf_counter
+
+import pygame
+from pygame import Surface
+
+from game_settings import Settings
+from engine import Engine, UP, DOWN, LEFT, RIGHT
+from items import FRUIT, HAZARD
+
+
+# file layout: a header, then one (tick, direction) record per input,
+# with version 2 adding the number of fruits and hazards to the header and
+# version 3 keeping its layout but spawning items only on empty cells, which
+# draws them differently, so older replays no longer play back
+MAGIC: bytes = b"SNKR"
+VERSION: int = 3
+HEADER: struct.Struct = struct.Struct("<4sBHHBQIIHH")
+EVENT: struct.Struct = struct.Struct("<IB")
+
+# directions are stored as 1-4, 0 is unused
+DIRECTIONS: tuple[tuple[int,int], ...] = (UP, DOWN, LEFT, RIGHT)
+
+
+class Replay:
+    """
+    The seed and inputs of a single game, enough to play it again exactly.
+    Inputs are stored only for the ticks that have one.
+    """
+    def __init__(self, settings: Settings, seed: int) -> None:
+        """
+        Initializes an empty replay.
+
+        :param settings: the settings the game is played with.
+        :param seed: the seed the game was started with.
+        """
+        self.grid_width: int = settings.grid_width
+        self.grid_height: int = settings.grid_height
+        self.fruit_margin: int = settings.fruit_margin
+        self.fruit_count: int = settings.fruit_count
+        self.hazard_count: int = settings.hazard_count
+        self.seed: int = seed
+
+        # number of ticks played and the (tick, direction) inputs
+        self.ticks: int = 0
+        self.inputs: list[tuple[int, tuple[int,int]]] = []
+
+
+    def record(self, action: tuple[int,int] | None) -> None:
+        """
+        Record the input given on the next tick.
+
+        :param action: the direction given to the engine, or None.
+        """
+        if action is not None:
+            self.inputs.append((self.ticks, action))
+        self.ticks += 1
+
+
+    def truncate(self, ticks: int) -> None:
+        """
+        Forget the ticks from a tick on, after the game is rewound to it.
+
+        :param ticks: the number of ticks to keep.
+        """
+        self.ticks = ticks
+        while self.inputs and self.inputs[-1][0] >= ticks:
+            self.inputs.pop()
+
+
+    def settings(self) -> Settings:
+        """
+        Return settings with the board the game was recorded on.
+        """
+        settings: Settings = Settings()
+        settings.grid_width = self.grid_width
+        settings.grid_height = self.grid_height
+        settings.fruit_margin = self.fruit_margin
+        settings.fruit_count = self.fruit_count
+        settings.hazard_count = self.hazard_count
+        return settings
+
+
+    def save(self, path: str) -> None:
+        """
+        Write the replay to a file.
+
+        :param path: the location of the file.
+        """
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data: bytearray = bytearray(HEADER.pack(MAGIC, VERSION,
+                                                self.grid_width,
+                                                self.grid_height,
+                                                self.fruit_margin,
+                                                self.seed, self.ticks,
+                                                len(self.inputs),
+                                                self.fruit_count,
+                                                self.hazard_count))
+        for tick, direction in self.inputs:
+            data += EVENT.pack(tick, DIRECTIONS.index(direction) + 1)
+
+        with open(path, "wb") as file:
+            file.write(data)
+
+
+    @classmethod
+    def load(cls, path: str) -> "Replay":
+        """
+        Read a replay from a file.
+
+        :param path: the location of the file.
+        :return: the replay.
+        """
+        with open(path, "rb") as file:
+            data: bytes = file.read()
+
+        magic, version = struct.unpack_from("<4sB", data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a supported replay")
+
+        fields: tuple = HEADER.unpack_from(data)
+        width, height, margin, seed, ticks, count = fields[2:8]
+        fruits, hazards = fields[8:]
+
+        settings: Settings = Settings()
+        settings.grid_width = width
+        settings.grid_height = height
+        settings.fruit_margin = margin
+        settings.fruit_count = fruits
+        settings.hazard_count = hazards
+
+        replay: Replay = cls(settings, seed)
+        replay.ticks = ticks
+        replay.inputs = [(tick, DIRECTIONS[code - 1]) for tick, code in
+                         EVENT.iter_unpack(data[HEADER.size:HEADER.size +
+                                                EVENT.size * count])]
+        return replay
+
+
+def play(replay: Replay, frames: set[int] | None = None,
+         on_frame=None) -> Engine:
+    """
+    Run a replay through the engine as fast as possible.
+
+    :param replay: the replay to play.
+    :param frames: ticks after which to render the board, if any.
+    :param on_frame: called with the tick and the rendered Surface for
+    each tick in frames.
+    :return: the engine in its final state.
+    """
+    settings: Settings = replay.settings()
+    engine: Engine = Engine(settings, replay.seed)
+    inputs = iter(replay.inputs)
+    next_input: tuple[int, tuple[int,int]] | None = next(inputs, None)
+
+    for tick in range(replay.ticks):
+        action: tuple[int,int] | None = None
+        if next_input and next_input[0] == tick:
+            action = next_input[1]
+            next_input = next(inputs, None)
+
+        engine.step(action)
+
+        if frames and tick in frames and on_frame:
+            on_frame(tick, render_board(engine, settings))
+
+    return engine
+
+
+def render_board(engine: Engine, settings: Settings) -> Surface:
+    """
+    Draw the board of an engine onto a new offscreen Surface.
+
+    :param engine: the engine to draw.
+    :param settings: the game settings.
+    :return: the drawn Surface.
+    """
+    size: int = settings.snake_size
+    board: Surface = Surface((settings.grid_width * size,
+                              settings.grid_height * size))
+    board.fill(settings.bg_color)
+
+    colors: tuple = (None, settings.fruit_color, settings.hazard_color)
+    for kind in (FRUIT, HAZARD):
+        for cell in engine.items.cells[kind]:
+            board.fill(colors[kind], (cell % settings.grid_width * size,
+                                      cell // settings.grid_width * size,
+                                      size, size))
+    for x, y in engine.body:
+        board.fill(settings.body_color, (x * size, y * size, size, size))
+    head_x, head_y = engine.body.head
+    board.fill(settings.head_color, (head_x * size, head_y * size, size, size))
+
+    return board
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play back a recorded "
+                                     "game without a window.")
+    parser.add_argument("path", help="the replay file")
+    parser.add_argument("--frames", default="",
+                        help="comma separated ticks to save as images")
+    parser.add_argument("--out", default="replay_frames",
+                        help="directory for the saved images")
+    args = parser.parse_args()
+
+    replay: Replay = Replay.load(args.path)
+    frames: set[int] = {int(tick) for tick in args.frames.split(",") if tick}
+
+    def save_frame(tick: int, board: Surface) -> None:
+        os.makedirs(args.out, exist_ok=True)
+        pygame.image.save(board, os.path.join(args.out, f"{tick:06}.png"))
+
+    start: float = perf_counter()
+    engine: Engine = play(replay, frames, save_frame)
+    elapsed: float = perf_counter() - start
+
+    print(f"seed {replay.seed}: score {engine.score}, length "
+          f"{engine.current_length}, {replay.ticks} ticks in "
+          f"{elapsed * 1000:.1f} ms "
+          f"({replay.ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
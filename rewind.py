@@ -0,0 +1,200 @@
+from array import array
+
+from engine import Engine, STOP, UP, DOWN, LEFT, RIGHT
+from items import FRUIT, HAZARD
+
+
+# what a tick changed, one bit each
+POPPED: int = 1
+GREW: int = 2
+PUSHED: int = 4
+COLLIDED: int = 8
+ATE_FRUIT: int = 16
+ATE_HAZARD: int = 32
+SPAWNED: int = 64
+
+# directions are stored as their index
+DIRECTIONS: tuple[tuple[int,int], ...] = (STOP, UP, DOWN, LEFT, RIGHT)
+
+
+class History:
+    """
+    The recent ticks of a game, kept so they can be undone. Rather than a
+    copy of the board per tick, each tick is stored as the few things it
+    changed, in a ring buffer of fixed-size records: which ends of the body
+    moved, the tail cell it dropped, where the cell taken by the head or a
+    spawned fruit was in the free cells index, what the head ate, and the
+    direction and fruit before it. Undoing a tick applies its record in
+    reverse to the live game, which is shared by every past state, so memory
+    grows with the number of ticks kept and the length of the snake, not
+    their product. The RNG state is only kept for the ticks that drew from
+    it, when a fruit spawned.
+    """
+    def __init__(self, engine: Engine, size: int) -> None:
+        """
+        Initializes an empty history.
+
+        :param engine: the game to record.
+        :param size: the number of ticks kept.
+        """
+        self.engine: Engine = engine
+        self.grid_width: int = engine.settings.grid_width
+        self.size: int = size
+
+        # the ticks kept, as a ring buffer of records starting at the oldest
+        self.flags: bytearray = bytearray(size)
+        self.tails: array = array("i", [0]) * size
+        self.positions: array = array("i", [0]) * size
+        self.directions: bytearray = bytearray(size)
+        self.fruits: array = array("i", [0]) * size
+        self.states: list[tuple | None] = [None] * size
+        self.start: int = 0
+        self.count: int = 0
+
+        # the RNG state since the last fruit spawned, which is the state
+        # before the next one spawns
+        self.rng_state: tuple = engine.rng.getstate()
+
+
+    def __len__(self) -> int:
+        """
+        Return the number of ticks that can be undone.
+        """
+        return self.count
+
+
+    def clear(self) -> None:
+        """
+        Forget every tick, after the engine starts a new game.
+        """
+        self.states = [None] * self.size
+        self.start = 0
+        self.count = 0
+        self.rng_state = self.engine.rng.getstate()
+
+
+    def step(self, action: tuple[int,int] | None = None) \
+        -> tuple[int, bool, int]:
+        """
+        Advance the game by one tick and record what it changed.
+
+        :param action: a direction to turn to first, or None to keep going.
+        :return: the result of the engine's step.
+        """
+        engine: Engine = self.engine
+        body = engine.body
+        items = engine.items
+
+        # the state the tick may change
+        ticks: int = engine.ticks
+        direction: tuple[int,int] = engine.direction
+        fruit_x, fruit_y = engine.fruit
+        pushed: int = body.pushed
+        popped: int = body.popped
+        current_length: int = engine.current_length
+        score: int = engine.score
+        hazards: int = items.count(HAZARD)
+        added: int = items.added
+        tail: int = body.ids[(body.start + body.count - 1) % body.capacity]
+
+        result: tuple[int, bool, int] = engine.step(action)
+        if engine.ticks == ticks:
+            return result
+
+        flags: int = 0
+        if body.popped != popped:
+            flags |= POPPED
+        if engine.current_length != current_length:
+            flags |= GREW
+        if body.pushed != pushed:
+            flags |= PUSHED
+            if engine.done and items.count(HAZARD) == hazards:
+                flags |= COLLIDED
+        if engine.score != score:
+            flags |= ATE_FRUIT
+        if items.count(HAZARD) != hazards:
+            flags |= ATE_HAZARD
+
+        # overwrite the oldest tick once the buffer is full
+        if self.count == self.size:
+            self.start = (self.start + 1) % self.size
+            self.count -= 1
+        index: int = (self.start + self.count) % self.size
+        self.count += 1
+
+        self.states[index] = None
+        if items.added != added:
+            flags |= SPAWNED
+            self.states[index] = self.rng_state
+            self.rng_state = engine.rng.getstate()
+
+        self.flags[index] = flags
+        self.tails[index] = tail
+        # where the spawned fruit's cell, or else the head's, was taken from
+        # in the free cells index
+        self.positions[index] = body.free.removed_from
+        self.directions[index] = DIRECTIONS.index(direction)
+        self.fruits[index] = fruit_y * self.grid_width + fruit_x
+        return result
+
+
+    def rewind(self, ticks: int) -> int:
+        """
+        Undo the most recent ticks, leaving the game exactly as it was
+        before them, down to the RNG and the order of the free cells.
+
+        :param ticks: the most ticks to undo.
+        :return: the number of ticks undone.
+        """
+        engine: Engine = self.engine
+        body = engine.body
+        items = engine.items
+        width: int = self.grid_width
+
+        undone: int = 0
+        while self.count and undone < ticks:
+            self.count -= 1
+            index: int = (self.start + self.count) % self.size
+            flags: int = self.flags[index]
+
+            # take back the spawned fruit, returning its cell to where it was
+            # in the free cells index, and the draws that placed it
+            position: int = self.positions[index]
+            if flags & SPAWNED:
+                fruit_x, fruit_y = engine.fruit
+                fruit: int = fruit_y * width + fruit_x
+                items.remove(fruit)
+                body.free.undo_remove(fruit, position)
+                self.rng_state = self.states[index]
+                self.states[index] = None
+                engine.rng.setstate(self.rng_state)
+
+                # the head had moved onto the eaten fruit, which was never
+                # in the free cells index
+                position = -1
+
+            # put back what the head ate, then move the head and tail back
+            head: int = body.ids[body.start]
+            if flags & ATE_FRUIT:
+                items.add(head, FRUIT)
+                engine.length -= 1
+                engine.score -= 1
+            if flags & ATE_HAZARD:
+                items.add(head, HAZARD)
+
+            if flags & PUSHED:
+                body.pop_head(position, bool(flags & COLLIDED))
+            if flags & POPPED:
+                tail: int = self.tails[index]
+                body.push_tail(tail % width, tail // width)
+            if flags & GREW:
+                engine.current_length -= 1
+
+            fruit = self.fruits[index]
+            engine.fruit = (fruit % width, fruit // width)
+            engine.direction = DIRECTIONS[self.directions[index]]
+            engine.ticks -= 1
+            engine.done = False
+            undone += 1
+
+        return undone
@@ -1,9 +1,134 @@
+from pygame.event import Event
+
+
+# names of the scenes
+START: str = "start"
+GAME: str = "game"
+END: str = "end"
+
+
+class Scene:
+    """
+    A screen of the game, handling its own events, ticks and drawing.
+    """
+    def handle_event(self, event: Event) -> None:
+        """
+        Handle an input or timer event.
+
+        :param event: the event.
+        """
+
+
+    def update(self) -> None:
+        """
+        Advance the scene by one tick.
+        """
+
+
+    def draw(self, alpha: float = 1.0) -> None:
+        """
+        Draw the scene.
+
+        :param alpha: how far the head has moved towards its current cell.
+        """
+
+
+    def enter(self) -> None:
+        """
+        Called when the scene becomes the current one.
+        """
+
+
+    def exit(self) -> None:
+        """
+        Called when another scene replaces this one.
+        """
+
+
+    def is_static(self) -> bool:
+        """
+        Return whether the scene only changes on input or timer events, so
+        the game loop can sleep until one arrives.
+        """
+        return False
+
+
+    def animates(self) -> bool:
+        """
+        Return whether the scene changes every frame, rather than only after
+        ticks and events.
+        """
+        return False
+
+
 class SceneManager:
     """Represents an instance of the scene handler."""
     def __init__(self) -> None:
         """Initializes the scene manager object."""
-        self.game_screen_active: bool = False
-        self.end_screen_active: bool = False
-        self.start_screen_active: bool = True
+        # the scene objects by name, and the name of the current scene,
+        # which can change before any scene objects are added
+        self.scenes: dict[str, Scene] = {}
+        self.current_name: str = START
+
+        self.game_paused: bool = False
+
+        # whether something changed since the current scene was last drawn
+        self.dirty: bool = True
+
+
+    @property
+    def current(self) -> Scene:
+        """
+        Return the current scene.
+        """
+        return self.scenes[self.current_name]
+
+
+    @property
+    def start_screen_active(self) -> bool:
+        """
+        Return whether the start screen is showing.
+        """
+        return self.current_name == START
+
+
+    @property
+    def game_screen_active(self) -> bool:
+        """
+        Return whether a game is being played.
+        """
+        return self.current_name == GAME
+
+
+    @property
+    def end_screen_active(self) -> bool:
+        """
+        Return whether the game over screen is showing.
+        """
+        return self.current_name == END
+
+
+    def add(self, name: str, scene: Scene) -> None:
+        """
+        Add a scene object.
+
+        :param name: the name of the scene.
+        :param scene: the scene.
+        """
+        self.scenes[name] = scene
+        if name == self.current_name:
+            scene.enter()
+
+
+    def switch(self, name: str) -> None:
+        """
+        Make another scene the current one.
 
-        self.game_paused: bool = False
\ No newline at end of file
+        :param name: the name of the scene.
+        """
+        if self.current_name in self.scenes:
+            self.current.exit()
+        self.current_name = name
+        self.dirty = True
+        if name in self.scenes:
+            self.current.enter()
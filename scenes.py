@@ -0,0 +1,189 @@
+import pygame
+from pygame import Surface
+from pygame.event import Event
+
+from game_settings import Settings
+import game_functions as gf
+from ui_handler import UIHandler
+from scene_manager import Scene, SceneManager, GAME
+from audio_handler import AudioHandler
+from snake import Snake
+from renderer import Renderer
+from controls import DIRECTION_KEYS
+
+
+class BaseScene(Scene):
+    """
+    A scene of the game, with references to everything it draws and plays.
+    """
+    def __init__(self, settings: Settings, screen: Surface, ui: UIHandler,
+                 scene: SceneManager, snake: Snake, audio: AudioHandler,
+                 renderer: Renderer | None) -> None:
+        """
+        Initializes a scene.
+
+        :param settings: the game settings.
+        :param screen: the screen.
+        :param ui: a reference to the ui handler.
+        :param scene: a reference to the scene manager.
+        :param snake: the snake game object.
+        :param audio: a reference to the audio handler.
+        :param renderer: the renderer, or None to redraw the whole screen
+        every frame.
+        """
+        self.settings: Settings = settings
+        self.screen: Surface = screen
+        self.ui: UIHandler = ui
+        self.scene: SceneManager = scene
+        self.snake: Snake = snake
+        self.audio: AudioHandler = audio
+        self.renderer: Renderer | None = renderer
+
+
+    def handle_event(self, event: Event) -> None:
+        """
+        Handle the keys that work in every scene.
+
+        :param event: the event.
+        """
+        # toggle the frame timing overlay
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and \
+            self.ui.profiler:
+            self.ui.show_profiler = not self.ui.show_profiler
+
+
+    def draw(self, alpha: float = 1.0) -> None:
+        """
+        Draw the scene.
+
+        :param alpha: how far the head has moved towards its current cell.
+        """
+        if self.renderer:
+            self.renderer.draw(alpha)
+        else:
+            gf.update_screen(self.settings, self.screen, self.ui,
+                             self.scene, self.snake, alpha)
+
+
+class StartScene(BaseScene):
+    """
+    The title screen, with a snake chasing a fruit behind the play button.
+    """
+    def handle_event(self, event: Event) -> None:
+        """
+        Start a game when the play button is clicked.
+
+        :param event: the event.
+        """
+        super().handle_event(event)
+        if event.type == pygame.MOUSEBUTTONDOWN and self.ui.start_hover:
+            self.scene.switch(GAME)
+            self.audio.action_sound.play()
+
+
+    def update(self) -> None:
+        """
+        Move the menu snake.
+        """
+        self.ui.update_start_animation()
+        self.scene.dirty = True
+
+
+class PlayScene(BaseScene):
+    """
+    A game in progress, which stands still while paused.
+    """
+    def handle_event(self, event: Event) -> None:
+        """
+        Handle movement, the autopilot, rewinding and pausing.
+
+        :param event: the event.
+        """
+        super().handle_event(event)
+        if event.type != pygame.KEYDOWN:
+            return
+
+        # gameplay controls
+        direction: tuple[int,int] | None = DIRECTION_KEYS.get(event.key)
+        if direction and not self.scene.game_paused and \
+            self.snake.queue_turn(direction):
+            self.ui.moving = True
+            self.audio.move_sound.play()
+
+        # toggle the autopilot
+        if event.key == pygame.K_TAB:
+            self.snake.autopilot_active = not self.snake.autopilot_active
+            self.ui.moving = True
+
+        # step back in time, pausing so the player can pick up from there
+        if event.key == pygame.K_r and self.snake.rewind():
+            self.audio.action_sound.play()
+            self.scene.game_paused = True
+
+        # pause game
+        if event.key == pygame.K_ESCAPE:
+            self.audio.action_sound.play()
+            self.scene.game_paused = not self.scene.game_paused
+
+
+    def update(self) -> None:
+        """
+        Advance the game by one tick.
+        """
+        if not self.scene.game_paused:
+            self.snake.update()
+
+
+    def is_static(self) -> bool:
+        """
+        Return whether the game is paused.
+        """
+        return self.scene.game_paused
+
+
+    def animates(self) -> bool:
+        """
+        Return whether the snake is moving between cells.
+        """
+        return not self.scene.game_paused
+
+
+class EndScene(BaseScene):
+    """
+    The game over screen, which only changes when its text blinks.
+    """
+    def enter(self) -> None:
+        """
+        Start blinking the play again text.
+        """
+        pygame.time.set_timer(self.ui.BLINKEVENT, 500)
+
+
+    def exit(self) -> None:
+        """
+        Stop the blink timer so it does not wake other scenes.
+        """
+        pygame.time.set_timer(self.ui.BLINKEVENT, 0)
+
+
+    def handle_event(self, event: Event) -> None:
+        """
+        Blink the play again text and play again on P.
+
+        :param event: the event.
+        """
+        super().handle_event(event)
+        if event.type == self.ui.BLINKEVENT:
+            self.ui.play_current = next(self.ui.play_blinker)
+
+        # play again after losing
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            self.audio.action_sound.play()
+            gf.reset_game(self.ui, self.scene, self.snake)
+
+
+    def is_static(self) -> bool:
+        """
+        Return True, the end screen only changes on events.
+        """
+        return True
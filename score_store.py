@@ -0,0 +1,173 @@
+import atexit
+import os
+import shelve
+import sqlite3
+import threading
+from concurrent.futures import Future
+from queue import Queue
+
+
+class ScoreStore:
+    """
+    A local leaderboard of every finished game kept in sqlite. All disk
+    access happens on a background writer thread, so recording a game or
+    running a query never blocks the game loop.
+    """
+    def __init__(self, path: str = "save_data/scores.db") -> None:
+        """
+        Initializes the store and opens the database in the background.
+
+        :param path: the location of the database file.
+        """
+        self.path: str = path
+
+        # best score so far, filled in once the database has been read
+        self.highscore: int = 0
+
+        # jobs for the writer thread, None asks it to stop
+        self.jobs: Queue = Queue()
+        self.thread: threading.Thread = threading.Thread(target=self.run,
+                                                         daemon=True)
+        self.thread.start()
+
+        # write out pending games when the game exits
+        atexit.register(self.close)
+
+
+    def run(self) -> None:
+        """
+        Open the database and run queued jobs until asked to stop.
+        """
+        directory: str = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection: sqlite3.Connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY,
+                    score INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    duration REAL NOT NULL,
+                    seed INTEGER,
+                    played_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+                )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS games_score "
+                               "ON games (score DESC)")
+            connection.execute("CREATE INDEX IF NOT EXISTS games_played_at "
+                               "ON games (played_at)")
+        self.import_highscore(connection)
+
+        best: int | None = connection.execute(
+            "SELECT MAX(score) FROM games").fetchone()[0]
+        self.highscore = max(self.highscore, best or 0)
+
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            job(connection)
+
+        connection.close()
+
+
+    def import_highscore(self, connection: sqlite3.Connection) -> None:
+        """
+        Carry over the high score saved by earlier versions of the game
+        into an empty leaderboard.
+
+        :param connection: the open database.
+        """
+        if connection.execute("SELECT 1 FROM games LIMIT 1").fetchone():
+            return
+
+        old_path: str = os.path.join(os.path.dirname(self.path), "hs.txt")
+        try:
+            with shelve.open(old_path, flag="r") as data:
+                highscore: int = data.get("hs", 0)
+        except Exception:
+            return
+
+        if highscore:
+            with connection:
+                connection.execute("INSERT INTO games (score, length, "
+                                   "duration) VALUES (?, ?, 0)",
+                                   (highscore, highscore + 1))
+
+
+    def record(self, score: int, length: int, duration: float,
+               seed: int | None) -> None:
+        """
+        Save a finished game in the background.
+
+        :param score: the final score.
+        :param length: the final length of the snake.
+        :param duration: the length of the game in seconds.
+        :param seed: the seed the game was played with.
+        """
+        self.highscore = max(self.highscore, score)
+
+        def insert(connection: sqlite3.Connection) -> None:
+            # each game is written in its own transaction
+            with connection:
+                connection.execute("INSERT INTO games (score, length, "
+                                   "duration, seed) VALUES (?, ?, ?, ?)",
+                                   (score, length, duration, seed))
+
+        self.jobs.put(insert)
+
+
+    def query(self, sql: str, parameters: tuple = ()) -> Future:
+        """
+        Run a query in the background.
+
+        :param sql: the query.
+        :param parameters: values for the query's placeholders.
+        :return: a future resolving to the list of result rows.
+        """
+        future: Future = Future()
+
+        def select(connection: sqlite3.Connection) -> None:
+            try:
+                future.set_result(connection.execute(sql,
+                                                     parameters).fetchall())
+            except sqlite3.Error as error:
+                future.set_exception(error)
+
+        self.jobs.put(select)
+        return future
+
+
+    def top(self, count: int = 10) -> Future:
+        """
+        Fetch the best games.
+
+        :param count: the number of games to fetch.
+        :return: a future resolving to (score, length, duration, seed,
+        played_at) rows, best first.
+        """
+        return self.query("SELECT score, length, duration, seed, played_at "
+                          "FROM games ORDER BY score DESC LIMIT ?", (count,))
+
+
+    def daily(self) -> Future:
+        """
+        Fetch per-day statistics.
+
+        :return: a future resolving to (day, games, best score, average
+        score) rows, most recent first.
+        """
+        return self.query("SELECT date(played_at) AS day, COUNT(*), "
+                          "MAX(score), AVG(score) FROM games "
+                          "GROUP BY day ORDER BY day DESC")
+
+
+    def close(self) -> None:
+        """
+        Finish writing pending games and stop the writer thread.
+        """
+        if self.thread.is_alive():
+            self.jobs.put(None)
+            self.thread.join()
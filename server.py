@@ -0,0 +1,170 @@
+import argparse
+import asyncio
+import sys
+
+from game_settings import Settings
+from engine import Engine
+from input_queue import InputQueue
+from network import NEW_GAME, DIRECTIONS, encode_start, encode_tick
+
+
+# bytes a client may leave unread before it is dropped as too slow
+WRITE_LIMIT: int = 64 * 1024
+
+
+class Session:
+    """
+    A game played by one connected client. The server owns the game and
+    the client only sends inputs.
+    """
+    def __init__(self, settings: Settings,
+                 writer: asyncio.StreamWriter) -> None:
+        """
+        Initializes a session and starts its first game.
+
+        :param settings: the game settings.
+        :param writer: the stream to the client.
+        """
+        self.engine: Engine = Engine(settings)
+        self.inputs: InputQueue = InputQueue(settings.input_queue_size)
+        self.writer: asyncio.StreamWriter = writer
+        self.writer.write(encode_start(self.engine))
+
+
+    def receive(self, code: int) -> None:
+        """
+        Handle an input from the client.
+
+        :param code: a direction as 1-4, or NEW_GAME.
+        """
+        engine: Engine = self.engine
+        if code == NEW_GAME:
+            if engine.done:
+                engine.reset()
+                self.inputs.clear()
+                self.writer.write(encode_start(engine))
+        elif code <= len(DIRECTIONS):
+            self.inputs.push(DIRECTIONS[code - 1], engine.direction,
+                             engine.length)
+
+
+    def tick(self) -> None:
+        """
+        Advance the game by one tick and send the client what changed.
+        """
+        engine: Engine = self.engine
+        if engine.done:
+            return
+
+        pushed: int = engine.body.pushed
+        popped: int = engine.body.popped
+        fruit: tuple[int,int] = engine.fruit
+        score: int = engine.score
+
+        engine.step(self.inputs.pop())
+
+        message: bytes = encode_tick(engine, pushed, popped, fruit, score)
+        if message:
+            self.writer.write(message)
+
+
+class GameServer:
+    """
+    Runs a game for every connected client on a single shared clock, so
+    each tick is one pass over the sessions however many there are.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes a server with no sessions.
+
+        :param settings: the game settings.
+        """
+        self.settings: Settings = settings
+        self.sessions: set[Session] = set()
+        self.ticks: int = 0
+
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """
+        Serve a client until it disconnects.
+
+        :param reader: the stream from the client.
+        :param writer: the stream to the client.
+        """
+        session: Session = Session(self.settings, writer)
+        self.sessions.add(session)
+        try:
+            while data := await reader.read(64):
+                for code in data:
+                    session.receive(code)
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.discard(session)
+            writer.close()
+
+
+    async def run_ticks(self) -> None:
+        """
+        Tick every session at the tick rate, scheduling each tick from the
+        start time rather than the last tick so the clock does not drift.
+        """
+        loop = asyncio.get_running_loop()
+        interval: float = 1 / self.settings.tick_rate
+        next_tick: float = loop.time()
+
+        while True:
+            next_tick += interval
+            await asyncio.sleep(max(next_tick - loop.time(), 0))
+
+            for session in list(self.sessions):
+                if session.writer.transport.get_write_buffer_size() > \
+                    WRITE_LIMIT:
+                    self.sessions.discard(session)
+                    session.writer.close()
+                    continue
+                session.tick()
+            self.ticks += 1
+
+            # skip ticks that are already late instead of bunching them up
+            if loop.time() > next_tick + interval:
+                next_tick = loop.time()
+
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+        Accept clients and run the game clock until cancelled.
+
+        :param host: the address to listen on.
+        :param port: the port to listen on.
+        """
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"serving on {host}:{server.sockets[0].getsockname()[1]} at "
+              f"{self.settings.tick_rate} ticks/s", file=sys.stderr)
+
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.run_ticks())
+
+
+def main() -> None:
+    settings: Settings = Settings()
+    parser = argparse.ArgumentParser(description="Run games for network "
+                                     "clients.")
+    parser.add_argument("--host", default=settings.server_host,
+                        help="address to listen on")
+    parser.add_argument("--port", type=int, default=settings.server_port,
+                        help="port to listen on")
+    parser.add_argument("--tick-rate", type=int, default=settings.tick_rate,
+                        help="ticks per second")
+    args = parser.parse_args()
+
+    settings.tick_rate = args.tick_rate
+    try:
+        asyncio.run(GameServer(settings).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
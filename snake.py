@@ -1,32 +1,29 @@
-import random as rng
-
-import pygame
 from pygame import Surface, Rect
 
 from game_settings import Settings
 from ui_handler import UIHandler
-from scene_manager import SceneManager
+from scene_manager import SceneManager, END
 from audio_handler import AudioHandler
+from body import Body
+from engine import Engine
+from items import Items, FRUIT, HAZARD
+from input_queue import InputQueue
+from score_store import ScoreStore
+from replay import Replay
+from camera import Camera
+from tiles import Tiles
+from autopilot import Autopilot
+from rewind import History
 
-import shelve
-
-
-class Node:
-    """Represents a single section of the snake's body."""
-    def __init__(self, settings: Settings) -> None:
-        """
-        Initializes a node.
-
-        :param settings: a reference to the game settings.
-        """
-        self.x_pos: int = settings.screen_width // 2
-        self.y_pos: int = settings.screen_height // 2
-
-        self.next: Node | None = None
+import threading
+from itertools import chain
 
 
 class Snake:
-    """A linked list representing the snake."""
+    """
+    The on-screen snake, drawing and playing sounds for the game run by
+    a headless engine.
+    """
     def __init__(self, settings: Settings, screen: Surface,
                  ui: UIHandler, scene: SceneManager,
                  audio: AudioHandler) -> None:
@@ -46,162 +43,232 @@ class Snake:
         self.scene: SceneManager = scene
         self.audio: AudioHandler = audio
 
-        # set size of a the snake's parts
+        # set size of a the snake's parts, and the tiles they are drawn with
         self.size: int =  self.settings.snake_size
+        self.tiles: Tiles = self.ui.tiles
 
-        # set the length that the snake should be as well as the current
-        # number of nodes
-        self.length: int = 1
-        self.current_length: int = 1
+        # view of the board when it is larger than the window
+        self.camera: Camera | None = None
+        if self.settings.large_world:
+            self.camera = Camera(self.settings)
 
-        # set the speed of the snake
-        self.speed_x, self.speed_y = 0, 0
+        # direction changes waiting for their tick
+        self.inputs: InputQueue = InputQueue(self.settings.input_queue_size)
 
-        # create a head node
-        self.head: Node = Node(self.settings)
+        # the game rules, which also spawn the first fruit
+        self.engine: Engine = Engine(self.settings)
 
-        # spawn a fruit
-        self.fruit: tuple[int,int] = (0,0)
-        self.spawn_fruit()
+        # the recent ticks, kept so the game can be rewound
+        self.history: History | None = None
+        if self.settings.rewind_seconds:
+            self.history = History(self.engine,
+                                   self.settings.rewind_seconds *
+                                   self.settings.tick_rate)
 
-        # load highscore
-        self.highscore = 0
-        self.data: shelve.Shelf = shelve.open("save_data/hs.txt")
-        try:
-            self.highscore: int = self.data["hs"]
-        except KeyError:
-            self.data["hs"] = self.highscore
-        self.data.close()
+        # computer control, toggled in game
+        self.autopilot: Autopilot = Autopilot(self.engine)
+        self.autopilot_active: bool = self.settings.autopilot
 
+        # the seed and inputs of the current game
+        self.replay: Replay = Replay(self.settings, self.engine.seed)
 
-    def update(self) -> None:
+        # load the leaderboard in the background
+        self.scores: ScoreStore = ScoreStore(self.settings.save_path)
+
+
+    def queue_turn(self, direction: tuple[int,int]) -> bool:
         """
-        Update the position of the snake.
+        Queue a direction change for an upcoming tick.
+
+        :param direction: the new direction.
+        :return: True if the turn was accepted.
         """
-        # get new position
-        new_x = self.head.x_pos + self.speed_x
-        new_y = self.head.y_pos + self.speed_y
+        return self.inputs.push(direction, self.engine.direction,
+                                self.engine.length)
 
-        # add new head
-        new_head: Node = Node(self.settings)
 
-        new_head.x_pos = new_x
-        new_head.y_pos = new_y
+    @property
+    def highscore(self) -> int:
+        """
+        The best score on the leaderboard.
+        """
+        return self.scores.highscore
+
+
+    @property
+    def body(self) -> Body:
+        """
+        The cells covered by the snake, from head to tail.
+        """
+        return self.engine.body
+
 
-        new_head.next = self.head
-        self.head = new_head
+    @property
+    def length(self) -> int:
+        """
+        The length that the snake should be.
+        """
+        return self.engine.length
+
+
+    @property
+    def current_length(self) -> int:
+        """
+        The current number of cells covered by the snake.
+        """
+        return self.engine.current_length
 
-        # delete the tail or add
-        if self.length == self.current_length:
-            current_node: Node = self.head
-            while current_node.next and current_node.next.next:
-                current_node = current_node.next
 
-            current_node.next = None
+    @property
+    def fruit(self) -> tuple[int,int]:
+        """
+        The position of the fruit in board pixels.
+        """
+        return (self.engine.fruit[0] * self.size,
+                self.engine.fruit[1] * self.size)
+
+
+    def update(self) -> None:
+        """
+        Update the position of the snake.
+        """
+        # let the autopilot steer through the same queue as the keyboard
+        if self.autopilot_active:
+            self.inputs.clear()
+            direction: tuple[int,int] | None = self.autopilot.decide()
+            if direction:
+                self.queue_turn(direction)
+
+        action: tuple[int,int] | None = self.inputs.pop(
+            not self.autopilot_active)
+        self.replay.record(action)
+        if self.history is not None:
+            reward, done, score = self.history.step(action)
         else:
-            self.current_length += 1
+            reward, done, score = self.engine.step(action)
+        self.ui.score = score
 
-        # check for fruit
-        if (new_x, new_y) == self.fruit:
-            self.length += 1
-            self.ui.score += 1
-            self.spawn_fruit()
+        if reward > 0:
             self.audio.fruit_sound.play()
 
-        # check for collision with tail
-        if not self.head.next:
-            return
-        
-        current_node: Node | None = self.head.next
-        while current_node:
-            if (new_x,new_y) == (current_node.x_pos,current_node.y_pos):
-                self.end_game()
-                return
-            current_node = current_node.next
-            
+        if done:
+            self.end_game()
 
-    def draw_snake(self) -> None:
-        """
-        Draw the each node of the snake in the appropriate positions.
+
+    def rewind(self) -> int:
         """
-        # draw fruit
-        fruit_rect: Rect = Rect(0,0, self.size, self.size)
-        fruit_rect.x, fruit_rect.y = self.fruit[0], self.fruit[1]
-        pygame.draw.rect(self.screen, self.settings.fruit_color, fruit_rect)
+        Step the game back by the rewind step, forgetting the inputs of the
+        ticks undone.
 
-        # draw snake
-        current_node: Node | None = self.head
+        :return: the number of ticks undone.
+        """
+        if self.history is None:
+            return 0
 
-        while current_node:
-            rect: Rect = Rect(0,0, self.size, self.size)
-            rect.x = current_node.x_pos
-            rect.y = current_node.y_pos
+        undone: int = self.history.rewind(self.settings.rewind_step *
+                                          self.settings.tick_rate)
+        self.replay.truncate(self.engine.ticks)
+        self.inputs.clear()
+        self.ui.score = self.engine.score
+        return undone
 
-            color: tuple[int,int,int] = self.settings.head_color if \
-                                        current_node == self.head else \
-                                        self.settings.body_color
 
-            pygame.draw.rect(self.screen, color, rect)
+    def draw_snake(self, alpha: float = 1.0) -> None:
+        """
+        Draw the each node of the snake in the appropriate positions.
 
-            # check if out of bounds
-            if current_node == self.head:
-                out_of_bounds: bool = rect.left < 0 or \
-                      rect.right > self.settings.screen_width or \
-                      rect.top < 0 or \
-                      rect.bottom > self.settings.screen_height
-                if out_of_bounds:
-                    self.end_game()
-                
-            current_node = current_node.next
+        :param alpha: how far the head has moved from its previous cell
+        towards its current one, from 0 to 1.
+        """
+        if self.camera:
+            self.draw_view(alpha)
+        else:
+            # draw the fruits, hazards and body in one batch and the head
+            # on top
+            items: Items = self.engine.items
+            self.screen.blits(list(chain(
+                map(self.tiles.item_pairs[FRUIT].__getitem__,
+                    items.cells[FRUIT]),
+                map(self.tiles.item_pairs[HAZARD].__getitem__,
+                    items.cells[HAZARD]),
+                map(self.tiles.body_pairs.__getitem__,
+                    self.body.cell_ids(1)))), doreturn=False)
+            self.screen.blit(self.tiles.head, self.head_rect(alpha))
 
         # display pause screen over snake
         if self.scene.game_paused:
            self.ui.display_pause()
 
 
-    def spawn_fruit(self) -> None:
+    def draw_view(self, alpha: float) -> None:
+        """
+        Draw the part of a large board around the head, looking up only the
+        body cells in view.
+
+        :param alpha: how far the head has moved towards its current cell.
         """
-        Spawn a fruit in a random position.
+        head: Rect = self.head_rect(alpha)
+        self.camera.follow(head)
+        left, top, right, bottom = self.camera.visible_cells()
+
+        # draw the fruits and hazards in view
+        items: tuple[Surface | None, ...] = self.tiles.items
+        self.screen.blits([(items[kind], (x * self.size - self.camera.x,
+                                          y * self.size - self.camera.y))
+                           for x, y, kind in self.engine.items.visible(
+                               left, top, right, bottom)], doreturn=False)
+
+        # draw the body in one batch, leaving the head's cell to the moving
+        # head
+        head_cell: tuple[int,int] = self.body.head
+        tile: Surface = self.tiles.body
+        self.screen.blits([(tile, (x * self.size - self.camera.x,
+                                   y * self.size - self.camera.y))
+                           for x, y in self.body.chunks.visible(left, top,
+                                                                right, bottom)
+                           if (x, y) != head_cell], doreturn=False)
+        self.screen.blit(self.tiles.head, self.camera.to_screen(head))
+
+
+    def head_rect(self, alpha: float = 1.0) -> Rect:
         """
-        # ensure the fruit is in a new position and not on the
-        # snake's tail
-        current_pos: tuple[int,int] = self.fruit
-        new_x: int = rng.randint(1,28) * 10
-        new_y: int = rng.randint(1,18) * 10
-        new_pos: tuple[int,int] = (new_x, new_y)
+        Return the area of the head in board pixels, placed between its
+        previous and current cell.
 
-        current_node: Node | None = self.head
-        positions: list[tuple[int,int]] = []
-        while current_node:
-            positions.append((current_node.x_pos, current_node.y_pos))
-            current_node = current_node.next
+        :param alpha: how far the head has moved from its previous cell
+        towards its current one, from 0 to 1.
+        :return: the Rect covered by the head.
+        """
+        x, y = self.body.head
+
+        # the previous head stays in the buffer after the first tick, even
+        # once it has been dropped as the tail
+        if self.engine.ticks and alpha < 1.0:
+            prev_x, prev_y = self.body.cell(1)
+            return Rect(round((prev_x + (x - prev_x) * alpha) * self.size),
+                        round((prev_y + (y - prev_y) * alpha) * self.size),
+                        self.size, self.size)
 
-        while current_pos == new_pos or new_pos in positions:
-            new_x = rng.randint(1,28) * 10
-            new_y = rng.randint(1,18) * 10
-            new_pos = (new_x, new_y)
+        return Rect(x * self.size, y * self.size, self.size, self.size)
 
-        # set fruit position
-        self.fruit = (new_x, new_y)
 
-    
     def end_game(self) -> None:
         """
         End the game when the player loses.
         """
         # switch scenes
-        self.scene.game_screen_active = False
-        self.scene.end_screen_active = True
-        pygame.time.set_timer(self.ui.BLINKEVENT, 500)
-
-        # update and save highscore
-        if self.ui.score > self.highscore:
-            self.highscore = self.ui.score
+        self.scene.switch(END)
 
-        self.data: shelve.Shelf = shelve.open("save_data/hs.txt")
-        self.data["hs"] = self.highscore
+        # save the game in the background and update the highscore
+        self.scores.record(self.engine.score, self.engine.current_length,
+                           self.engine.ticks / self.settings.tick_rate,
+                           self.engine.seed)
         self.ui.highscore = self.highscore
-        self.data.close() 
+
+        # keep the last game so it can be played back
+        if self.settings.replay_path:
+            threading.Thread(target=self.replay.save,
+                             args=(self.settings.replay_path,)).start()
 
         # play sfx
         self.audio.lose_sound.play()
@@ -211,14 +278,9 @@ class Snake:
         """
         Reset the snake at the start of a new game.
         """
-        # delete all tail nodes
-        self.head.next = None
-
-        # reset the position
-        self.head.x_pos = self.settings.screen_width // 2
-        self.head.y_pos = self.settings.screen_height // 2
-
-        # reset the length and speed attributes
-        self.length: int = 1
-        self.current_length: int = 1
-        self.speed_x, self.speed_y = 0, 0
\ No newline at end of file
+        # start a new game and drop any queued inputs
+        self.engine.reset()
+        self.inputs.clear()
+        self.replay = Replay(self.settings, self.engine.seed)
+        if self.history is not None:
+            self.history.clear()
\ No newline at end of file
@@ -0,0 +1,69 @@
+from collections import deque
+from time import perf_counter
+
+
+class StartupTimer:
+    """Measures and reports how long each phase of startup takes."""
+    def __init__(self, enabled: bool = True) -> None:
+        """
+        Initializes a startup timer and starts the clock.
+
+        :param enabled: whether to print each phase as it finishes.
+        """
+        self.enabled: bool = enabled
+        self.start: float = perf_counter()
+        self.last: float = self.start
+
+        # phase names with their durations in milliseconds
+        self.phases: list[tuple[str, float]] = []
+
+        # phases timed on background threads with the time they finished,
+        # waiting to be reported from the main thread so output from the
+        # two threads does not interleave
+        self.pending: deque[tuple[str, float, float]] = deque()
+
+
+    def mark(self, phase: str) -> None:
+        """
+        Record the end of a phase that started when the previous one ended.
+
+        :param phase: the name of the phase.
+        """
+        self.report_pending()
+        now: float = perf_counter()
+        self.report(phase, (now - self.last) * 1000, now)
+        self.last = now
+
+
+    def record(self, phase: str, duration: float) -> None:
+        """
+        Record a phase timed on a background thread, to be reported by the
+        main thread.
+
+        :param phase: the name of the phase.
+        :param duration: how long the phase took in milliseconds.
+        """
+        self.pending.append((phase, duration, perf_counter()))
+
+
+    def report_pending(self) -> None:
+        """
+        Report the phases finished on background threads since the last
+        call, from the main thread.
+        """
+        while self.pending:
+            self.report(*self.pending.popleft())
+
+
+    def report(self, phase: str, duration: float, end: float) -> None:
+        """
+        Keep a phase and print it if reporting is enabled.
+
+        :param phase: the name of the phase.
+        :param duration: how long the phase took in milliseconds.
+        :param end: when the phase finished.
+        """
+        self.phases.append((phase, duration))
+        if self.enabled:
+            print(f"startup: {phase} {duration:.1f} ms "
+                  f"(at {(end - self.start) * 1000:.1f} ms)")
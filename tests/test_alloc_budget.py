@@ -0,0 +1,119 @@
+import statistics
+import tracemalloc
+
+import pytest
+
+# benchmark runs the game without a window or sound card
+import benchmark
+from benchmark import board_settings, cycle, build_snake, hot_paths
+from audio_handler import AudioHandler
+from snake import Snake
+import replay
+
+import pygame
+
+
+# board sizes in cells and snake lengths as fractions of the board
+GRIDS: tuple[tuple[int,int], ...] = ((30, 20), (60, 40))
+FRACTIONS: tuple[float, ...] = (0.0, 0.25, 0.5, 1.0)
+
+# for each hot path: the memory held at once during a typical call, as a
+# fixed allowance plus an allowance per cell of the snake, and the most
+# memory blocks left behind per call once caches have warmed up
+BUDGETS: dict[str, tuple[int, int, float]] = {
+    "update": (1024, 0, 0.05),
+    "spawn_fruit": (512, 0, 0.05),
+    "draw_snake": (1024, 16, 0.05),
+    "draw_ui": (512, 0, 0.05),
+}
+
+# calls made before measuring, so caches are filled, and calls measured
+WARMUP: int = 100
+CALLS: int = 500
+
+
+def allocations(function, calls: int) -> tuple[int, float, float]:
+    """
+    Measure the memory a function allocates.
+
+    :param function: the function to call with no arguments.
+    :param calls: the number of calls to measure.
+    :return: the median over calls of the most memory held at once during
+    the call in bytes, so the occasional resize of a growing list is not
+    counted, and the bytes and blocks left behind per call.
+    """
+    for _ in range(WARMUP):
+        function()
+
+    # ignore memory allocated by tracemalloc, this module and the
+    # benchmark's code driving the hot paths, and the inputs the replay
+    # keeps on purpose
+    ignored: tuple = (tracemalloc.Filter(False, tracemalloc.__file__),
+                      tracemalloc.Filter(False, __file__),
+                      tracemalloc.Filter(False, benchmark.__file__),
+                      tracemalloc.Filter(False, replay.__file__))
+
+    tracemalloc.start()
+    peaks: list[int] = []
+    for _ in range(calls):
+        tracemalloc.reset_peak()
+        current: int = tracemalloc.get_traced_memory()[0]
+        function()
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+
+    before = tracemalloc.take_snapshot()
+    for _ in range(calls):
+        function()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # filter once both snapshots are taken, as filtering compiles patterns
+    stats = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), "filename")
+    return (round(statistics.median(peaks)),
+            sum(stat.size_diff for stat in stats) / calls,
+            sum(stat.count_diff for stat in stats) / calls)
+
+
+@pytest.fixture(scope="module")
+def snakes(tmp_path_factory):
+    """
+    Build each board and snake length once for all of the hot paths, and
+    close their score stores afterwards.
+    """
+    pygame.init()
+    directory: str = str(tmp_path_factory.mktemp("alloc_budget"))
+    audio: AudioHandler = AudioHandler(cache_dir=directory)
+    built: dict[tuple[int, int, int], tuple[Snake, dict]] = {}
+
+    def build(width: int, height: int, length: int) -> tuple[Snake, dict]:
+        if (width, height, length) not in built:
+            path: list[tuple[int,int]] = cycle(width, height)
+            snake: Snake = build_snake(board_settings(width, height,
+                                                      directory),
+                                       length, path, audio)
+
+            # let the score store finish opening on its thread
+            snake.scores.top(1).result()
+            built[width, height, length] = (snake,
+                                            hot_paths(snake, path, length))
+        return built[width, height, length]
+
+    yield build
+    for snake, _ in built.values():
+        snake.scores.close()
+
+
+@pytest.mark.parametrize("name", BUDGETS)
+@pytest.mark.parametrize("fraction", FRACTIONS)
+@pytest.mark.parametrize("grid", GRIDS, ids=lambda grid: "x".join(map(str,
+                                                                      grid)))
+def test_hot_path_within_budget(snakes, grid, fraction, name):
+    width, height = grid
+    length: int = max(1, round(width * height * fraction))
+    _, functions = snakes(width, height, length)
+
+    fixed, per_cell, kept = BUDGETS[name]
+    peak, net_bytes, net_blocks = allocations(functions[name], CALLS)
+    assert peak <= fixed + per_cell * length
+    assert net_blocks <= kept, f"{net_bytes:.1f} B kept per call"
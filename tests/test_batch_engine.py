@@ -0,0 +1,161 @@
+import random
+
+import numpy as np
+
+from game_settings import Settings
+from engine import Engine, UP, DOWN, LEFT, RIGHT
+from items import FRUIT
+from batch_engine import BatchEngine, KEEP
+import batch_engine
+
+
+# the single-game direction for each batch action
+DIRECTIONS: dict[int, tuple[int,int] | None] = {
+    KEEP: None, batch_engine.UP: UP, batch_engine.DOWN: DOWN,
+    batch_engine.LEFT: LEFT, batch_engine.RIGHT: RIGHT,
+}
+
+
+def board_settings() -> Settings:
+    """
+    Settings for a small board with a single fruit and no hazards, which is
+    what the batch engine plays.
+    """
+    settings: Settings = Settings()
+    settings.grid_width = 8
+    settings.grid_height = 6
+    settings.fruit_count = 1
+    settings.hazard_count = 0
+    return settings
+
+
+def force_fruit(engine: Engine, cell: int) -> None:
+    """
+    Move an engine's fruit to a cell, so it matches the batch's draw.
+    """
+    width: int = engine.settings.grid_width
+    fruit_x, fruit_y = engine.fruit
+    engine.remove_item(fruit_y * width + fruit_x)
+    engine.body.free.remove(cell)
+    engine.items.add(cell, FRUIT)
+    engine.fruit = (cell % width, cell // width)
+
+
+def assert_same(batch: BatchEngine, row: int, engine: Engine) -> None:
+    """
+    Check that a board of the batch holds the same game as an engine.
+    """
+    width: int = batch.grid_width
+    length: int = int(batch.current_length[row])
+    body: list[int] = [int(batch.body[row, (batch.start[row] + offset) %
+                                      batch.cells])
+                       for offset in range(length)]
+
+    assert (batch.head_x[row], batch.head_y[row]) == engine.body.head
+    assert body == [y * width + x for x, y in engine.body]
+    assert length == engine.current_length
+    assert batch.length[row] == engine.length
+    assert batch.score[row] == engine.score
+    assert batch.fruit[row] == engine.fruit[1] * width + engine.fruit[0]
+
+
+def step_both(batch: BatchEngine, engines: list[Engine],
+              actions: list[int]) -> list[tuple[int, bool]]:
+    """
+    Step the batch and one engine per board through the same actions,
+    restarting the engines whose games ended as the batch does, and check
+    that every board matches its engine afterwards.
+
+    :return: the reward and whether the game ended, for each board.
+    """
+    rewards, done, scores = batch.step(np.array(actions))
+    results: list[tuple[int, bool]] = []
+    for row, engine in enumerate(engines):
+        reward, ended, score = engine.step(DIRECTIONS[actions[row]])
+        assert (reward, ended, score) == (rewards[row], done[row],
+                                          scores[row])
+        if ended:
+            engine.reset(row)
+
+        # the engine takes whichever fruit the batch drew
+        fruit: int = int(batch.fruit[row])
+        if fruit != engine.fruit[1] * batch.grid_width + engine.fruit[0]:
+            force_fruit(engine, fruit)
+        assert_same(batch, row, engine)
+        results.append((reward, ended))
+    return results
+
+
+def start_both(count: int, seed: int) -> tuple[BatchEngine, list[Engine]]:
+    """
+    Start a batch and one engine per board with the same fruits.
+    """
+    settings: Settings = board_settings()
+    batch: BatchEngine = BatchEngine(settings, count, seed)
+    engines: list[Engine] = [Engine(settings, row) for row in range(count)]
+    for row, engine in enumerate(engines):
+        force_fruit(engine, int(batch.fruit[row]))
+        assert_same(batch, row, engine)
+    return batch, engines
+
+
+def test_scripted_game_matches_engine():
+    batch, engines = start_both(1, 0)
+    engine: Engine = engines[0]
+    width: int = batch.grid_width
+
+    def place(x: int, y: int) -> None:
+        batch.fruit[0] = y * width + x
+        force_fruit(engine, y * width + x)
+
+    # grow to four cells by eating three fruits from the middle (4, 3)
+    place(5, 3)
+    assert step_both(batch, engines, [batch_engine.RIGHT]) == [(1, False)]
+    place(5, 2)
+    assert step_both(batch, engines, [batch_engine.UP]) == [(1, False)]
+    place(4, 2)
+    assert step_both(batch, engines, [batch_engine.LEFT]) == [(1, False)]
+    place(0, 0)
+    assert step_both(batch, engines, [batch_engine.LEFT]) == [(0, False)]
+    assert engine.current_length == 4
+
+    # circle a square, the head moving onto the cell the tail just left
+    for action in (batch_engine.DOWN, batch_engine.RIGHT, batch_engine.UP,
+                   batch_engine.LEFT, batch_engine.DOWN):
+        assert step_both(batch, engines, [action]) == [(0, False)]
+
+    # reversing is ignored once the snake is longer than one cell
+    assert step_both(batch, engines, [batch_engine.UP]) == [(0, False)]
+    assert engine.direction == DOWN
+
+    # running off the bottom edge ends the game and starts a new one
+    results: list[tuple[int, bool]] = []
+    while not results or not results[-1][1]:
+        results += step_both(batch, engines, [KEEP])
+    assert results[-1] == (-1, True)
+    assert engine.body.head == (width // 2, batch.grid_height // 2)
+
+
+def test_random_games_match_engine():
+    batch, engines = start_both(6, 1)
+    rng: random.Random = random.Random(2)
+
+    grew = died = blocked = 0
+    for _ in range(2000):
+        actions: list[int] = [rng.choice((KEEP, KEEP, batch_engine.UP,
+                                          batch_engine.DOWN,
+                                          batch_engine.LEFT,
+                                          batch_engine.RIGHT))
+                              for _ in engines]
+        for row, engine in enumerate(engines):
+            direction = DIRECTIONS[actions[row]]
+            if direction and engine.length > 1 and \
+                    direction == (-engine.direction[0], -engine.direction[1]):
+                blocked += 1
+
+        for reward, ended in step_both(batch, engines, actions):
+            grew += reward == 1
+            died += ended
+
+    # the games were long enough to grow, reverse and die
+    assert grew and died and blocked
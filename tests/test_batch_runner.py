@@ -0,0 +1,10 @@
+from batch_runner import play_games
+
+
+def test_results_do_not_depend_on_chunks():
+    for policy in ("autopilot", "random"):
+        together = play_games(policy, range(0, 8))
+        apart = play_games(policy, range(0, 4)) + play_games(policy,
+                                                             range(4, 8))
+        assert together == apart
+        assert play_games(policy, range(4, 8)) == together[4:]
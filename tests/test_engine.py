@@ -0,0 +1,78 @@
+from game_settings import Settings
+from engine import Engine
+from autopilot import Autopilot
+
+
+def play_out(engine: Engine) -> tuple:
+    """
+    Play a game to the end with the autopilot and describe how it went.
+    """
+    autopilot: Autopilot = Autopilot(engine)
+    fruits: list[tuple[int,int]] = [engine.fruit]
+    while not engine.done and engine.ticks < 2000:
+        engine.step(autopilot.decide())
+        fruits.append(engine.fruit)
+    return fruits, list(engine.body), engine.score, engine.ticks
+
+
+def test_reset_matches_fresh_engine():
+    settings: Settings = Settings()
+    settings.fruit_count = 3
+    settings.hazard_count = 2
+
+    for seed in range(5, 10):
+        engine: Engine = Engine(settings, seed + 100)
+        play_out(engine)
+
+        # a reset after a game starts the same game as a new engine
+        engine.reset(seed)
+        fresh: Engine = Engine(settings, seed)
+        assert engine.fruit == fresh.fruit
+        assert bytes(engine.items.kinds) == bytes(fresh.items.kinds)
+        assert play_out(engine) == play_out(fresh)
+
+
+def test_items_stay_out_of_free_cells():
+    settings: Settings = Settings()
+    settings.fruit_count = 40
+    settings.hazard_count = 20
+
+    for seed in range(5):
+        engine: Engine = Engine(settings, seed)
+        free = engine.body.free
+        draws: list[int] = []
+        choice = free.choice
+
+        def counted_choice(rng):
+            draws.append(1)
+            return choice(rng)
+        free.choice = counted_choice
+
+        autopilot: Autopilot = Autopilot(engine)
+        while not engine.done and engine.ticks < 500:
+            spawned: int = engine.items.added
+            draws.clear()
+            engine.step(autopilot.decide())
+
+            # every spawn takes a single draw, which lands on an empty cell
+            assert len(draws) == engine.items.added - spawned
+            assert not any(free.positions[cell] >= 0 for cell in
+                           range(len(free.positions))
+                           if engine.items.kinds[cell])
+
+
+def test_large_world_after_construction():
+    settings: Settings = Settings()
+    settings.world_width = 80
+    settings.world_height = 60
+    settings.use_large_world()
+
+    # the board follows the switch even though it came after the settings
+    engine: Engine = Engine(settings, 1)
+    assert (engine.body.grid_width, engine.body.grid_height) == (80, 60)
+    assert engine.body.chunks is not None
+
+    settings.use_large_world(False)
+    engine = Engine(settings, 1)
+    assert (engine.body.grid_width, engine.body.grid_height) == (30, 20)
+    assert engine.body.chunks is None
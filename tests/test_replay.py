@@ -0,0 +1,43 @@
+import os
+
+# run without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from benchmark import board_settings
+from audio_handler import AudioHandler
+from scene_manager import SceneManager, GAME
+from ui_handler import UIHandler
+from snake import Snake
+from replay import Replay, play
+
+
+def test_later_games_in_a_session_replay(tmp_path):
+    pygame.init()
+    settings = board_settings(30, 20, str(tmp_path))
+    screen = pygame.Surface((settings.screen_width, settings.screen_height))
+    scene: SceneManager = SceneManager()
+    scene.switch(GAME)
+    ui: UIHandler = UIHandler(settings, screen, scene)
+    snake: Snake = Snake(settings, screen, ui, scene,
+                         AudioHandler(cache_dir=str(tmp_path)))
+    snake.autopilot_active = True
+
+    try:
+        for _ in range(3):
+            scene.switch(GAME)
+            snake.reset_snake()
+            while scene.game_screen_active and snake.engine.ticks < 1500:
+                snake.update()
+
+            # save and load the game, then play it back from its seed
+            path: str = str(tmp_path / "game.replay")
+            snake.replay.save(path)
+            engine = play(Replay.load(path))
+            assert list(engine.body) == list(snake.body)
+            assert engine.score == snake.engine.score
+            assert engine.ticks == snake.engine.ticks
+    finally:
+        snake.scores.close()
@@ -0,0 +1,74 @@
+import random
+
+from game_settings import Settings
+from engine import Engine
+from autopilot import Autopilot
+from rewind import History
+from replay import Replay, play
+
+
+def board_settings(seed: int) -> Settings:
+    """
+    Settings for a small board, with several fruits and hazards on some.
+    """
+    settings: Settings = Settings()
+    settings.grid_width = 12
+    settings.grid_height = 10
+    settings.fruit_count = (1, 3)[seed % 2]
+    settings.hazard_count = (0, 2)[seed % 3 == 0]
+    return settings
+
+
+def check_free_cells(engine: Engine) -> None:
+    """
+    Check that the free cells index holds exactly the spawnable cells with
+    neither the body nor an item on them, each at the position its reverse
+    lookup gives.
+    """
+    free = engine.body.free
+    cells: list[int] = list(free.cells[:free.count])
+    for position, cell in enumerate(cells):
+        assert free.positions[cell] == position
+
+    expected: set[int] = {cell for cell in range(len(free.spawnable))
+                          if free.spawnable[cell] and
+                          not engine.body.occupied[cell] and
+                          not engine.items.kinds[cell]}
+    assert set(cells) == expected
+    assert sum(position >= 0 for position in free.positions) == free.count
+
+
+def test_rewind_keeps_free_cells_and_replays():
+    for seed in range(60):
+        settings: Settings = board_settings(seed)
+        engine: Engine = Engine(settings, seed)
+        autopilot: Autopilot = Autopilot(engine)
+        history: History = History(engine, 40)
+        replay: Replay = Replay(settings, seed)
+        moves: random.Random = random.Random(seed)
+
+        for _ in range(600):
+            if engine.done:
+                break
+
+            action: tuple[int,int] | None = autopilot.decide()
+            replay.record(action)
+            history.step(action)
+
+            # rewind by random amounts, sometimes several times in a row
+            while moves.random() < 0.1:
+                history.rewind(moves.randint(1, 30))
+                replay.truncate(engine.ticks)
+                check_free_cells(engine)
+
+        check_free_cells(engine)
+
+        # the rewound game plays out exactly like a fresh one given the
+        # inputs that were kept
+        fresh: Engine = play(replay)
+        assert list(fresh.body) == list(engine.body)
+        assert bytes(fresh.items.kinds) == bytes(engine.items.kinds)
+        assert fresh.score == engine.score
+        assert fresh.rng.getstate() == engine.rng.getstate()
+        assert list(fresh.body.free.cells[:fresh.body.free.count]) == \
+            list(engine.body.free.cells[:engine.body.free.count])
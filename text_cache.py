@@ -0,0 +1,48 @@
+from collections import OrderedDict
+
+from pygame import Surface
+from pygame.font import Font
+
+
+class TextCache:
+    """
+    A bounded cache of rendered text surfaces, evicting the least recently
+    used entry when full.
+    """
+    def __init__(self, capacity: int = 64) -> None:
+        """
+        Initializes an empty text cache.
+
+        :param capacity: the maximum number of surfaces to keep.
+        """
+        self.capacity: int = capacity
+        self.surfaces: OrderedDict[tuple, Surface] = OrderedDict()
+
+
+    def render(self, font: Font, text: str, color: tuple[int,int,int],
+               alpha: int | None = None) -> Surface:
+        """
+        Return the rendered text, rendering it only if it is not cached.
+
+        :param font: the font to render with.
+        :param text: the text to render.
+        :param color: the color of the text.
+        :param alpha: the opacity of the surface, or None for opaque.
+        :return: the rendered text surface.
+        """
+        key: tuple = (font, text, color, alpha)
+        image: Surface | None = self.surfaces.get(key)
+
+        if image is not None:
+            self.surfaces.move_to_end(key)
+            return image
+
+        image = font.render(text, True, color)
+        if alpha is not None:
+            image.set_alpha(alpha)
+
+        self.surfaces[key] = image
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)
+
+        return image
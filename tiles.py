@@ -0,0 +1,68 @@
+import pygame
+from pygame import Surface
+
+from game_settings import Settings
+
+
+class Tiles:
+    """
+    Pre-built surfaces for the head, body, fruits and hazards, and tables
+    of the body and item tiles paired with the pixel position of every
+    board cell, so a whole snake and every item can be drawn in a single
+    blits call.
+    """
+    def __init__(self, settings: Settings) -> None:
+        """
+        Initializes the tiles from the game colors.
+
+        :param settings: the game settings.
+        """
+        size: int = settings.snake_size
+        self.head: Surface = self.tile(size, settings.head_color)
+        self.body: Surface = self.tile(size, settings.body_color)
+        self.fruit: Surface = self.tile(size, settings.fruit_color)
+        self.hazard: Surface = self.tile(size, settings.hazard_color)
+
+        # the tile of each kind of item, by its number in items
+        self.items: tuple[Surface | None, ...] = (None, self.fruit,
+                                                  self.hazard)
+
+        # (tile, position) pairs ready to hand to blits, indexed by cell,
+        # skipped on large boards where positions depend on the camera
+        self.body_pairs: list[tuple[Surface, tuple[int,int]]] = []
+        self.item_pairs: tuple[list[tuple[Surface, tuple[int,int]]], ...] = \
+            ([], [], [])
+        if not settings.large_world:
+            self.body_pairs = self.pairs(self.body, settings)
+            self.item_pairs = ([], self.pairs(self.fruit, settings),
+                               self.pairs(self.hazard, settings))
+
+
+    def tile(self, size: int, color: tuple[int,int,int]) -> Surface:
+        """
+        Create a square tile of a single color.
+
+        :param size: the width and height of the tile.
+        :param color: the color of the tile.
+        :return: the tile, in the display's pixel format if there is one.
+        """
+        tile: Surface = Surface((size, size))
+        tile.fill(color)
+        if pygame.display.get_surface():
+            tile = tile.convert()
+        return tile
+
+
+    def pairs(self, tile: Surface, settings: Settings) \
+        -> list[tuple[Surface, tuple[int,int]]]:
+        """
+        Pair a tile with the pixel position of every board cell.
+
+        :param tile: the tile.
+        :param settings: the game settings.
+        :return: the pairs, indexed by cell.
+        """
+        size: int = settings.snake_size
+        return [(tile, (x * size, y * size))
+                for y in range(settings.grid_height)
+                for x in range(settings.grid_width)]
@@ -6,6 +6,10 @@ from itertools import cycle
 
 from game_settings import Settings
 from scene_manager import SceneManager
+from text_cache import TextCache
+from profiler import FrameProfiler
+from tiles import Tiles
+from display import Display
 
 
 class UIHandler:
@@ -26,23 +30,23 @@ class UIHandler:
         self.screen_rect: Rect = self.screen.get_rect()
 
         # set up fonts and text colors
-        ## game fonts
-        self.score_font_single: Font = pygame.font.\
-            SysFont(None, 300)
-        self.score_font_double: Font = pygame.font.\
-             SysFont(None, 260)
-        self.instructions_font: Font = pygame.font.\
-            SysFont(None, 50)
+        ## game fonts, loaded from files to skip the system font scan
+        self.score_font_single: Font = pygame.font.Font(None, 300)
+        self.score_font_double: Font = pygame.font.Font(None, 260)
+        self.instructions_font: Font = pygame.font.Font(None, 50)
         self.score_color: tuple[int,int,int] = self.settings.score_color
 
+        # rendered text surfaces, shared by every text element
+        self.text_cache: TextCache = TextCache()
+
         # menu fonts
-        menu_font = "Trebuchet MS"
-        self.game_over_font: Font = pygame.font.SysFont(menu_font, 45)
-        self.final_score_font: Font = pygame.font.SysFont(menu_font, 18)
-        self.blinker_font: Font = pygame.font.SysFont(menu_font, 15)
-        self.pause_font: Font = pygame.font.SysFont(menu_font, 55)
-        self.title_font: Font = pygame.font.SysFont(menu_font, 60)
-        self.button_font: Font = pygame.font.SysFont(menu_font, 16)
+        menu_font: str = self.settings.menu_font
+        self.game_over_font: Font = pygame.font.Font(menu_font, 45)
+        self.final_score_font: Font = pygame.font.Font(menu_font, 18)
+        self.blinker_font: Font = pygame.font.Font(menu_font, 15)
+        self.pause_font: Font = pygame.font.Font(menu_font, 55)
+        self.title_font: Font = pygame.font.Font(menu_font, 60)
+        self.button_font: Font = pygame.font.Font(menu_font, 16)
 
         # keep track of the score and whether the snake has started movings
         self.score: int = 0
@@ -56,7 +60,8 @@ class UIHandler:
         self.play_blinker, self.play_rect = self.blinker(play_text)
         self.play_current: Surface = next(self.play_blinker)
 
-        # for start screen animation
+        # for start screen animation and the snake
+        self.tiles: Tiles = Tiles(self.settings)
         self.menu_fruit: tuple[int,int] = (self.settings.screen_width//2,
                                            self.settings.screen_height//2)
         self.menu_head: tuple[int,int] = (self.settings.screen_width//2 - 60,
@@ -69,6 +74,15 @@ class UIHandler:
         # start screen button
         self.start_hover: bool = False
 
+        # the display the screen belongs to, which maps mouse positions
+        # from the window when the screen is scaled
+        self.display: Display | None = None
+
+        # frame timing overlay, toggled in game
+        self.profiler: FrameProfiler | None = None
+        self.show_profiler: bool = False
+        self.profiler_font: Font = pygame.font.Font(None, 14)
+
 
     def draw_ui(self) -> None:
         """
@@ -90,62 +104,43 @@ class UIHandler:
             self.screen.blit(self.play_current, self.play_rect)
 
 
+    def update_start_animation(self) -> None:
+        """
+        Move the start menu snake and fruit one cell to the right, wrapping
+        onto the next row at the edge of the screen. Called once per tick.
+        """
+        self.menu_fruit = self.advance_menu_cell(self.menu_fruit)
+        self.menu_head = self.advance_menu_cell(self.menu_head)
+        self.menu_part1 = self.advance_menu_cell(self.menu_part1)
+        self.menu_part2 = self.advance_menu_cell(self.menu_part2)
+
+
+    def advance_menu_cell(self, position: tuple[int,int]) -> tuple[int,int]:
+        """
+        Move a start menu element one cell to the right.
+
+        :param position: the current position of the element.
+        :return: the new position of the element.
+        """
+        size: int = self.settings.snake_size
+        new_x: int = position[0] + size
+        new_y: int = position[1]
+        if new_x == self.settings.screen_width:
+            new_y += size
+        return (new_x % self.settings.screen_width,
+                new_y % self.settings.screen_height)
+
+
     def start_screen_animation(self) -> None:
         """
         Handles the start menu animation of the snake chasing a fruit across
         the screen.
         """
-        # get cell size and y values for each element
-        size: int = self.settings.snake_size
-        fruit_y: int = self.menu_fruit[1] % self.settings.screen_height
-        head_y: int = self.menu_head[1] % self.settings.screen_height
-        part1_y: int = self.menu_part1[1] % self.settings.screen_height
-        part2_y: int = self.menu_part2[1] % self.settings.screen_height
-
-        # fruit animation
-        new_x: int = (self.menu_fruit[0] + 10)
-        if new_x == self.settings.screen_width:
-            fruit_y += 10
-        new_x = new_x % self.settings.screen_width
-        self.menu_fruit = (new_x, fruit_y)
-        fruit_rect: Rect = Rect(0,0,size,size)
-        fruit_rect.x = new_x
-        fruit_rect.y = fruit_y
-        pygame.draw.rect(self.screen, self.settings.fruit_color,fruit_rect)
-        
-        # snake animation
-        ## head
-        new_x = (self.menu_head[0] + 10) 
-        if new_x == self.settings.screen_width:
-            head_y += 10
-        new_x = new_x % self.settings.screen_width
-        self.menu_head = (new_x, head_y)
-        head_rect: Rect = Rect(0,0,size,size)
-        head_rect.x = new_x
-        head_rect.y = head_y
-        pygame.draw.rect(self.screen, self.settings.head_color, head_rect)
-
-        ## part 1
-        new_x = (self.menu_part1[0] + 10) 
-        if new_x == self.settings.screen_width:
-            part1_y += 10
-        new_x = new_x % self.settings.screen_width
-        self.menu_part1 = (new_x, part1_y)
-        part1_rect: Rect = Rect(0,0,size,size)
-        part1_rect.x = new_x
-        part1_rect.y = part1_y
-        pygame.draw.rect(self.screen, self.settings.body_color,part1_rect)
-
-        ## part 2
-        new_x = (self.menu_part2[0] + 10) 
-        if new_x == self.settings.screen_width:
-            part2_y += 10
-        new_x = new_x % self.settings.screen_width
-        self.menu_part2 = (new_x, part2_y)
-        part2_rect: Rect = Rect(0,0,size,size)
-        part2_rect.x = new_x
-        part2_rect.y = part2_y
-        pygame.draw.rect(self.screen, self.settings.body_color,part2_rect)
+        self.screen.blits(((self.tiles.fruit, self.menu_fruit),
+                           (self.tiles.head, self.menu_head),
+                           (self.tiles.body, self.menu_part1),
+                           (self.tiles.body, self.menu_part2)),
+                          doreturn=False)
 
 
     def start_screen_title(self) -> None:
@@ -153,7 +148,8 @@ class UIHandler:
         Display the game title.
         """
         text: str = "SNAKE"
-        image: Surface = self.title_font.render(text, True, (0,0,0))
+        image: Surface = self.text_cache.render(self.title_font, text,
+                                                (0,0,0))
         image_rect: Rect = image.get_rect()
         image_rect.centerx = self.screen_rect.centerx
         image_rect.centery = self.screen_rect.centery - 20
@@ -171,13 +167,15 @@ class UIHandler:
 
         # create and render text
         text: str = 'PLAY'
-        message: Surface = self.button_font.render(text, True, (255,255,255))
+        message: Surface = self.text_cache.render(self.button_font, text,
+                                                  (255,255,255))
         message_rect: Rect = message.get_rect()
         message_rect.center = button.center
 
         # handle background change when the mouse hovers over the button
         button_color: tuple[int,int,int] = (0,0,0)
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.display.mouse_pos() if self.display else \
+                           pygame.mouse.get_pos()
 
         self.start_hover = False
 
@@ -205,17 +203,11 @@ class UIHandler:
         """
         Display the current score in the background of the game.
         """
-        # adjust font size base on number of digits.
-        if self.score < 10:
-            image: Surface = self.score_font_single.render(f"{self.score}",
-                                                           True,
-                                                           self.score_color)
-        else:
-            image = self.score_font_double.render(f"{self.score}", True,
-                                                  self.score_color)
-
-        # lower the opacity
-        image.set_alpha(180)
+        # adjust font size base on number of digits and lower the opacity
+        font: Font = self.score_font_single if self.score < 10 else \
+                     self.score_font_double
+        image: Surface = self.text_cache.render(font, f"{self.score}",
+                                                self.score_color, 180)
 
         # position the text
         image_rect: Rect = image.get_rect()
@@ -234,15 +226,15 @@ class UIHandler:
         """
         text1: str = "Use Arrow Keys"
         text2: str = "to Move"
-        image1: Surface = self.instructions_font.render(text1, True,
-                                                       self.score_color)
+        image1: Surface = self.text_cache.render(self.instructions_font,
+                                                 text1, self.score_color)
         image1_rect: Rect = image1.get_rect()
 
         image1_rect.centerx = self.screen_rect.centerx
         image1_rect.centery = self.screen_rect.centery-20
 
-        image2: Surface = self.instructions_font.render(text2, True,
-                                                       self.score_color)
+        image2: Surface = self.text_cache.render(self.instructions_font,
+                                                 text2, self.score_color)
         image2_rect: Rect = image2.get_rect()
 
         image2_rect.centerx = self.screen_rect.centerx
@@ -257,7 +249,8 @@ class UIHandler:
         Display the pause screen ui.
         """
         text: str = "PAUSED"
-        image: Surface = self.pause_font.render(text, True, (0,0,0))
+        image: Surface = self.text_cache.render(self.pause_font, text,
+                                                (0,0,0))
         image_rect: Rect = image.get_rect()
         image_rect.center = self.screen_rect.center
         self.screen.blit(image, image_rect)
@@ -269,7 +262,8 @@ class UIHandler:
         """
         # display game over text
         text: str = "GAME OVER"
-        image: Surface = self.game_over_font.render(text, True, (200,0,0))
+        image: Surface = self.text_cache.render(self.game_over_font, text,
+                                                (200,0,0))
         image_rect: Rect = image.get_rect()
         image_rect.centerx = self.screen_rect.centerx
         image_rect.centery = 50
@@ -278,8 +272,8 @@ class UIHandler:
 
         # display final score
         score: str = f"final score: {self.score}"
-        image2: Surface = self.final_score_font.render(score, True, 
-                                                       (0,0,0))
+        image2: Surface = self.text_cache.render(self.final_score_font,
+                                                 score, (0,0,0))
         image2_rect: Rect = image2.get_rect()
         image2_rect.centerx = self.screen_rect.centerx
         image2_rect.centery = 95
@@ -288,8 +282,8 @@ class UIHandler:
 
         # display high score
         highscore: str = f"high score: {self.highscore}"
-        image3: Surface = self.final_score_font.render(highscore, True,
-                                                       (0,0,0))
+        image3: Surface = self.text_cache.render(self.final_score_font,
+                                                 highscore, (0,0,0))
         image3_rect: Rect = image3.get_rect()
         image3_rect.centerx = self.screen_rect.centerx 
         image3_rect.centery = 120
@@ -297,6 +291,41 @@ class UIHandler:
         self.screen.blit(image3, image3_rect)
     
 
+    def display_profiler(self) -> None:
+        """
+        Display the frame rate, frame time percentiles and a histogram of
+        recent frame times in the top left corner.
+        """
+        if not self.profiler:
+            return
+
+        # background panel
+        panel: Rect = Rect(2, 2, 110, 44)
+        self.screen.fill((0,0,0), panel)
+
+        # frame rate and percentiles, which change every frame so they are
+        # not cached
+        lines: tuple[str, str] = (
+            f"FPS {self.profiler.fps():.0f}",
+            f"p50 {self.profiler.percentile(50):.1f} "
+            f"p99 {self.profiler.percentile(99):.1f} ms")
+        for row, line in enumerate(lines):
+            image: Surface = self.profiler_font.render(line, True,
+                                                       (255,255,255))
+            self.screen.blit(image, (panel.x + 3, panel.y + 3 + row * 11))
+
+        # histogram of frame times up to twice the target frame time
+        limit: float = 2000 / (self.settings.frame_rate or 60)
+        counts: list[int] = self.profiler.histogram(26, limit)
+        tallest: int = max(counts) or 1
+        for column, count in enumerate(counts):
+            height: int = round(count / tallest * 16)
+            if height:
+                bar: Rect = Rect(panel.x + 3 + column * 4,
+                                 panel.bottom - 2 - height, 3, height)
+                self.screen.fill(self.settings.body_color, bar)
+
+
     def blinker(self, text: str) -> tuple[cycle, Rect]:
         """
         Create a cycle object to alternate between text displayed at a higher